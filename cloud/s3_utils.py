@@ -4,6 +4,7 @@ Utility functions for interacting with AWS S3.
 import os
 import io
 import boto3
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from botocore.exceptions import ClientError
@@ -161,32 +162,43 @@ def create_mock_trade_data_for_s3(date_str=None):
     Create mock trade data for testing S3 integration.
     
     Args:
-        date_str: Date string in YYYY-MM-DD format, defaults to today
+        date_str: Date string in YYYY-MM-DD format, or a list of date strings
+            to build several days in one pass, defaults to today
         
     Returns:
-        pandas.DataFrame: Mock trade data
+        pandas.DataFrame: Mock trade data. When a list of dates is given the
+            frame has an extra 'date' column to split the days with groupby.
     """
     # Use today if no date provided
     if date_str is None:
         date_str = datetime.now().strftime('%Y-%m-%d')
     
-    # Parse date
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    
-    # Prepare data
-    tickers = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META']
-    records = []
-    
-    # Generate mock trades
-    for ticker in tickers:
-        # Generate 5-10 trades per ticker
-        for i in range(5, 10):
-            records.append({
-                'ticker': ticker,
-                'price': round(100 + i * 2.5, 2),
-                'quantity': i * 10,
-                'side': 'buy' if i % 2 == 0 else 'sell',
-                'timestamp': f"{date_str}T{10 + i:02d}:00:00"
-            })
-    
-    return pd.DataFrame(records)
+    single_day = isinstance(date_str, str)
+    dates = [date_str] if single_day else list(date_str)
+    
+    # Validate dates
+    for value in dates:
+        datetime.strptime(value, '%Y-%m-%d')
+    
+    # Prepare data: 5-10 trades per ticker, repeated for every day
+    tickers = np.array(['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META'])
+    steps = np.arange(5, 10)
+    per_day = len(tickers) * len(steps)
+    
+    i = np.tile(steps, len(tickers) * len(dates))
+    date_col = np.repeat(np.array(dates, dtype='datetime64[D]'), per_day)
+    timestamps = date_col.astype('datetime64[h]') + (10 + i).astype('timedelta64[h]')
+    
+    df = pd.DataFrame({
+        'ticker': np.tile(np.repeat(tickers, len(steps)), len(dates)),
+        'price': np.round(100 + i * 2.5, 2),
+        'quantity': i * 10,
+        'side': np.where(i % 2 == 0, 'buy', 'sell'),
+        'timestamp': pd.DatetimeIndex(timestamps).strftime('%Y-%m-%dT%H:%M:%S')
+    })
+    
+    if single_day:
+        return df
+    
+    df['date'] = date_col.astype(str)
+    return df
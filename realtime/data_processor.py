@@ -1,8 +1,9 @@
 """
 Process and store market data from the WebSocket feed.
 """
+import asyncio
 from datetime import datetime, timedelta
-from sqlalchemy import Column, String, Float, DateTime, Integer
+from sqlalchemy import Column, String, Float, DateTime, Integer, insert
 from collections import defaultdict
 from utils.logger import get_logger
 from config.database import get_db_session, Base, engine
@@ -45,22 +46,31 @@ Base.metadata.create_all(bind=engine)
 class DataProcessor:
     """
     Process and store time-based statistics from price data.
+    
+    Price updates are queued and drained by a background flusher task, which
+    writes every average that falls due in a batch with a single INSERT.
+    Call close() on shutdown so queued updates are not lost.
     """
-    def __init__(self, interval_minutes=5):
+    def __init__(self, interval_minutes=5, batch_size=500, queue_size=10000):
         """
         Initialize the data processor.
         
         Args:
             interval_minutes: Time interval in minutes for calculating averages
+            batch_size: Maximum number of queued updates handled per flush
+            queue_size: Maximum number of pending updates before producers wait
         """
         self.interval_minutes = interval_minutes
+        self.batch_size = batch_size
         self.price_buffer = defaultdict(list)  # {ticker: [(timestamp, price), ...]}
         self.last_processed = {}  # {ticker: timestamp}
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._flusher = None
         logger.info(f"Data processor initialized with {interval_minutes}-minute intervals")
     
     async def process_price_update(self, ticker, price, timestamp):
         """
-        Process a price update and store time-based statistics.
+        Queue a price update for processing.
         
         Args:
             ticker: Stock ticker symbol
@@ -71,81 +81,153 @@ class DataProcessor:
         if ticker is None:
             logger.warning("Received price update with None ticker, skipping")
             return
-            
-        # Add the price to buffer
-        self.price_buffer[ticker].append((timestamp, price))
         
-        # Check if it's time to calculate average
-        await self._calculate_averages_if_needed(ticker, timestamp)
+        self._ensure_flusher()
+        await self._queue.put((ticker, price, timestamp))
+    
+    async def close(self):
+        """
+        Process every queued update, store the averages of the partial
+        intervals still buffered and stop the flusher.
+        """
+        # The flusher stops once it reaches the sentinel queued after the updates
+        self._ensure_flusher()
+        await self._queue.put(None)
+        await self._flusher
+        self._flusher = None
+        
+        # Whatever is still buffered becomes a final, partial interval
+        intervals = []
+        for ticker, prices in self.price_buffer.items():
+            if prices:
+                intervals.append((ticker, prices[-1][0], prices))
+                self.price_buffer[ticker] = []
+        if intervals:
+            await asyncio.to_thread(self._store_average_prices, intervals)
+    
+    def _ensure_flusher(self):
+        """Start the flusher, or restart it if it has died, once a loop is running."""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def _flush_loop(self):
+        """Drain queued price updates in batches until the close sentinel."""
+        stopping = False
+        while not stopping:
+            rows = [await self._queue.get()]
+            try:
+                while len(rows) < self.batch_size:
+                    rows.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                pass
+            
+            if None in rows:
+                rows = rows[:rows.index(None)]
+                stopping = True
+            if not rows:
+                continue
+            
+            # The database round trip runs in a worker thread so it does not
+            # stall the event loop (and the websocket reader) while it waits
+            try:
+                await asyncio.to_thread(self._process_batch, rows)
+            except Exception as e:
+                logger.error(f"Error processing price batch: {str(e)}")
     
-    async def _calculate_averages_if_needed(self, ticker, timestamp):
+    def _process_batch(self, rows):
         """
-        Calculate and store averages if the time interval has passed.
+        Buffer a batch of price updates and store the averages that fall due.
+        
+        Ticks are handled in order, and an interval closes at the tick that
+        makes it due, so a backed-up queue still yields one record per
+        interval. All the records from the batch are written together.
         
         Args:
-            ticker: Stock ticker symbol
-            timestamp: Current timestamp
+            rows: List of (ticker, price, timestamp) tuples
         """
-        # Get the last processed time for the ticker
-        last_time = self.last_processed.get(ticker)
+        intervals = []  # [(ticker, end timestamp, [(timestamp, price), ...]), ...]
+        closed_at = {}  # {ticker: end of the last interval closed in this batch}
+        for ticker, price, timestamp in rows:
+            prices = self.price_buffer[ticker]
+            prices.append((timestamp, price))
+            
+            last_time = closed_at.get(ticker, self.last_processed.get(ticker))
+            if self._is_due(last_time, timestamp):
+                intervals.append((ticker, timestamp, prices))
+                self.price_buffer[ticker] = []
+                closed_at[ticker] = timestamp
         
-        # If there's no record or the interval has passed, calculate averages
-        if last_time is None or timestamp - last_time >= timedelta(minutes=self.interval_minutes):
-            await self._store_average_price(ticker, timestamp)
+        if intervals:
+            self._store_average_prices(intervals)
     
-    async def _store_average_price(self, ticker, timestamp):
+    def _is_due(self, last_time, timestamp):
         """
-        Calculate and store the average price for the ticker.
+        Check whether the averaging interval has passed.
         
         Args:
-            ticker: Stock ticker symbol
+            last_time: End of the last stored interval, or None
             timestamp: Current timestamp
         """
-        prices = self.price_buffer[ticker]
+        # If there's no record or the interval has passed, calculate averages
+        return last_time is None or timestamp - last_time >= timedelta(minutes=self.interval_minutes)
+    
+    def _store_average_prices(self, intervals):
+        """
+        Calculate and store average prices for several intervals at once.
+        
+        If the write fails the prices go back into the buffers, so the next
+        due interval for each ticker includes them.
         
-        if prices:
+        Args:
+            intervals: List of (ticker, end timestamp, prices) tuples, where
+                prices is a list of (timestamp, price) tuples, oldest first
+        """
+        records = []
+        for ticker, timestamp, prices in intervals:
             # Extract just the price values and timestamps
             price_values = [price for _, price in prices]
             timestamps = [ts for ts, _ in prices]
             
             # Calculate statistics
             avg_price = sum(price_values) / len(price_values)
-            min_price = min(price_values)
-            max_price = max(price_values)
-            start_time = min(timestamps)
             
             logger.info(f"Storing {self.interval_minutes}-minute average for {ticker}: ${avg_price:.2f}")
             
-            try:
-                # Create a database session without using context manager
-                session = next(get_db_session())
-                
-                # Create a new price average record
-                average_record = StockPriceAverage(
-                    ticker=ticker,
-                    interval_minutes=self.interval_minutes,
-                    start_time=start_time,
-                    end_time=timestamp,
-                    average_price=round(avg_price, 2),
-                    min_price=round(min_price, 2),
-                    max_price=round(max_price, 2),
-                    data_points=len(prices)
-                )
-                
-                # Add and commit
-                session.add(average_record)
-                session.commit()
-                
-                # Update the last processed time
+            records.append({
+                "ticker": ticker,
+                "interval_minutes": self.interval_minutes,
+                "start_time": min(timestamps),
+                "end_time": timestamp,
+                "average_price": round(avg_price, 2),
+                "min_price": round(min(price_values), 2),
+                "max_price": round(max(price_values), 2),
+                "data_points": len(prices)
+            })
+        
+        try:
+            # Create a database session without using context manager
+            session = next(get_db_session())
+            
+            # One multi-row INSERT for the whole batch
+            session.execute(insert(StockPriceAverage), records)
+            session.commit()
+            
+            # Update the last processed time; intervals are in time order
+            for ticker, timestamp, _ in intervals:
                 self.last_processed[ticker] = timestamp
-                
-                # Clear the buffer for the next interval
-                self.price_buffer[ticker] = []
-                
-            except Exception as e:
-                logger.error(f"Error storing price average for {ticker}: {str(e)}")
-                if 'session' in locals():
-                    session.rollback()
-            finally:
-                if 'session' in locals():
-                    session.close()
+            
+        except Exception as e:
+            tickers = ', '.join(dict.fromkeys(ticker for ticker, _, _ in intervals))
+            logger.error(f"Error storing price averages for {tickers}: {str(e)}")
+            if 'session' in locals():
+                session.rollback()
+            
+            # Put the prices back ahead of anything buffered since
+            restored = defaultdict(list)
+            for ticker, _, prices in intervals:
+                restored[ticker].extend(prices)
+            for ticker, prices in restored.items():
+                self.price_buffer[ticker] = prices + self.price_buffer[ticker]
+        finally:
+            if 'session' in locals():
+                session.close()
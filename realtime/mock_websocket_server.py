@@ -6,14 +6,15 @@ import json
 import random
 import websockets
 import logging
-from datetime import datetime
 import time
 import os
 import sys
+from urllib.parse import urlparse, parse_qs
 
 # Add the project root to the path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from realtime.schemas import PriceUpdate, msgpack_encoder
 
 # Configure logging for better debug information
 logging.basicConfig(
@@ -46,6 +47,9 @@ async def handle_client(websocket, path):
     # Track client connection with default subscription to all tickers
     client_id = id(websocket)
     client_subscriptions[client_id] = list(STOCKS.keys())
+    
+    # Clients can request MessagePack frames with ?fmt=msgpack
+    message_format = parse_qs(urlparse(path).query).get("fmt", ["json"])[0]
     logger.info(
         f"Client connected. ID: {client_id}, Total clients: {len(client_subscriptions)}"
     )
@@ -57,7 +61,9 @@ async def handle_client(websocket, path):
         )
 
         # Send price updates to this client
-        price_task = asyncio.create_task(send_price_updates(websocket, client_id))
+        price_task = asyncio.create_task(
+            send_price_updates(websocket, client_id, message_format)
+        )
 
         # Wait for either task to complete
         done, pending = await asyncio.wait(
@@ -100,8 +106,8 @@ async def handle_subscriptions(websocket, client_id):
             logger.error(f"Error processing subscription from client {client_id}: {str(e)}")
 
 
-async def send_price_updates(websocket, client_id):
-    """Send periodic price updates to client."""
+async def send_price_updates(websocket, client_id, message_format="json"):
+    """Send periodic price updates to client as JSON text or MessagePack frames."""
     try:
         while True:
             # Get subscribed tickers for this client
@@ -132,18 +138,23 @@ async def send_price_updates(websocket, client_id):
                 new_price = max(0.01, details["price"] + price_change)
                 STOCKS[ticker]["price"] = new_price
 
-                # Create price update message
-                current_time = datetime.now().isoformat()
-                price_data = {
-                    "type": "price_update",
-                    "ticker": ticker,
-                    "price": round(new_price, 2),
-                    "timestamp": current_time,
-                }
-
-                # Convert to JSON and send
-                message = json.dumps(price_data)
-                logger.debug(f"Sending {ticker} price: ${round(new_price, 2)}")
+                # Create price update message (timestamp as epoch milliseconds)
+                price = round(new_price, 2)
+                timestamp_ms = int(time.time() * 1000)
+
+                if message_format == "msgpack":
+                    # Binary frame, smaller and cheaper to decode than JSON
+                    message = msgpack_encoder.encode(
+                        PriceUpdate(type="price_update", ticker=ticker, price=price, t=timestamp_ms)
+                    )
+                else:
+                    message = json.dumps({
+                        "type": "price_update",
+                        "ticker": ticker,
+                        "price": price,
+                        "t": timestamp_ms,
+                    })
+                logger.debug(f"Sending {ticker} price: ${price}")
                 await websocket.send(message)
 
             # Sleep between updates - randomize to make it realistic
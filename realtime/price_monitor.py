@@ -4,7 +4,7 @@ Monitor stock prices for significant changes.
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 import os
 import sys
 
@@ -40,7 +40,7 @@ class PriceMonitor:
         """
         self.threshold_percent = threshold_percent
         self.window_seconds = window_seconds
-        self.price_history = defaultdict(list)  # {ticker: [(timestamp, price), ...]}
+        self.price_history = defaultdict(deque)  # {ticker: deque([(timestamp, price), ...])}
         self.last_average_calc = {}  # For calculation timing
         self.last_alert_time = {}  # To prevent alert spam
         logger.info(f"Price monitor initialized with {threshold_percent}% threshold over {window_seconds} seconds")
@@ -167,11 +167,10 @@ class PriceMonitor:
         # Define cutoff time (double the window to keep some history)
         cutoff_time = current_time - timedelta(seconds=self.window_seconds * 2)
         
-        # Remove old entries
-        self.price_history[ticker] = [
-            (t, p) for t, p in self.price_history[ticker] 
-            if t >= cutoff_time
-        ]
+        # Remove old entries from the left; history is kept in arrival order
+        history = self.price_history[ticker]
+        while history and history[0][0] < cutoff_time:
+            history.popleft()
     
     def calculate_averages(self, current_time, interval_minutes=5):
         """
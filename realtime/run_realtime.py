@@ -21,7 +21,10 @@ logger = logging.getLogger("run_realtime")
 async def start_client():
     """Start the WebSocket client."""
     client = WebSocketClient()
-    await client.connect()
+    try:
+        await client.connect()
+    finally:
+        await client.close()
 
 def start_server_process():
     """Start the WebSocket server in a separate process."""
@@ -40,6 +43,13 @@ def main():
     # Wait for server to initialize
     time.sleep(2)
     
+    # Use the libuv-based event loop when available (not on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         # Start the client in the main event loop
         logger.info("Starting WebSocket client...")
@@ -0,0 +1,27 @@
+"""
+Message schemas for the real-time WebSocket feed.
+"""
+from typing import Optional
+import msgspec
+
+class PriceUpdate(msgspec.Struct, frozen=True, omit_defaults=True):
+    """
+    Price update frame sent by the WebSocket server.
+    
+    The server sends the update time as epoch milliseconds in ``t``; the
+    ISO-8601 ``timestamp`` field is still accepted from older servers.
+    Clients that connect with ``?fmt=msgpack`` receive the same struct as
+    binary MessagePack frames instead of JSON text.
+    """
+    type: str
+    ticker: str
+    price: float
+    t: Optional[int] = None
+    timestamp: Optional[str] = None
+
+# Decoders are compiled once and reused for every frame
+price_update_decoder = msgspec.json.Decoder(PriceUpdate)
+message_decoder = msgspec.json.Decoder(dict)
+msgpack_price_update_decoder = msgspec.msgpack.Decoder(PriceUpdate)
+msgpack_message_decoder = msgspec.msgpack.Decoder(dict)
+msgpack_encoder = msgspec.msgpack.Encoder()
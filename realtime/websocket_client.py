@@ -3,6 +3,8 @@ Client for connecting to the WebSocket server and processing price updates.
 """
 import asyncio
 import json
+import random
+import msgspec
 import websockets
 import logging
 from datetime import datetime
@@ -16,6 +18,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.logger import get_logger
 from realtime.price_monitor import PriceMonitor
 from realtime.data_processor import DataProcessor
+from realtime.schemas import (
+    price_update_decoder, message_decoder,
+    msgpack_price_update_decoder, msgpack_message_decoder
+)
 
 logger = get_logger("websocket_client")
 
@@ -23,28 +29,46 @@ class WebSocketClient:
     """
     Client for connecting to the WebSocket server and processing price updates.
     """
-    def __init__(self, uri="ws://localhost:8765", reconnect_interval=5):
+    def __init__(self, uri="ws://localhost:8765", reconnect_interval=0.25, message_format="msgpack",
+                 max_backoff=60.0, stable_connection_seconds=30.0):
         """
         Initialize the WebSocket client.
         
         Args:
             uri: WebSocket server URI
-            reconnect_interval: Seconds to wait before reconnection attempts
+            reconnect_interval: Initial seconds to wait before reconnection attempts
+            message_format: Wire format requested from the server ('msgpack' or 'json')
+            max_backoff: Upper bound in seconds for the exponential reconnect delay
+            stable_connection_seconds: Connections lasting longer than this reset the delay
         """
         self.uri = uri
+        self.message_format = message_format
         self.reconnect_interval = reconnect_interval
+        self.max_backoff = max_backoff
+        self.stable_connection_seconds = stable_connection_seconds
         self.connected = False
         self.price_monitor = PriceMonitor(threshold_percent=2.0)
         self.data_processor = DataProcessor()
         
         # Subscribe to specific tickers
         self.subscriptions = ["AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "NVDA"]
+        self._subscription_set = frozenset(self.subscriptions)
     
     async def connect(self):
         """Connect to the WebSocket server and handle messages."""
+        # Negotiate the wire format through the query string
+        uri = self.uri
+        if self.message_format != "json":
+            uri += ("&" if "?" in uri else "?") + f"fmt={self.message_format}"
+        
+        loop = asyncio.get_running_loop()
+        backoff = self.reconnect_interval
+        
         while True:
+            connected_at = None
             try:
-                async with websockets.connect(self.uri) as websocket:
+                async with websockets.connect(uri) as websocket:
+                    connected_at = loop.time()
                     self.connected = True
                     logger.info(f"Connected to {self.uri}")
                     
@@ -65,9 +89,19 @@ class WebSocketClient:
                 logger.error(f"WebSocket error: {e}")
                 self.connected = False
             
-            # Wait before reconnecting
-            logger.info(f"Attempting to reconnect in {self.reconnect_interval} seconds...")
-            await asyncio.sleep(self.reconnect_interval)
+            # A connection that stayed up for a while counts as recovered
+            if connected_at is not None and loop.time() - connected_at > self.stable_connection_seconds:
+                backoff = self.reconnect_interval
+            
+            # Exponential backoff with jitter before reconnecting
+            delay = backoff + random.uniform(0, backoff * 0.25)
+            logger.info(f"Attempting to reconnect in {delay:.2f} seconds...")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, self.max_backoff)
+    
+    async def close(self):
+        """Flush the data processor before the client goes away."""
+        await self.data_processor.close()
     
     async def _process_messages(self, websocket):
         """
@@ -78,39 +112,56 @@ class WebSocketClient:
         """
         async for message in websocket:
             try:
-                data = json.loads(message)
+                # Binary frames are MessagePack, text frames are JSON
+                if isinstance(message, bytes):
+                    update_decoder, generic_decoder = msgpack_price_update_decoder, msgpack_message_decoder
+                else:
+                    update_decoder, generic_decoder = price_update_decoder, message_decoder
                 
-                # Check message type
-                if data.get("type") == "price_update":
-                    ticker = data.get("ticker")
-                    price = data.get("price")
-                    timestamp_str = data.get("timestamp")
+                # Fast path: decode and validate price updates in one pass
+                try:
+                    update = update_decoder.decode(message)
+                except msgspec.ValidationError:
+                    update = None
+                
+                if update is not None and update.type == "price_update":
+                    # Drop updates for tickers we are not subscribed to
+                    if self._subscription_set and update.ticker not in self._subscription_set:
+                        continue
                     
-                    # Skip invalid messages
-                    if ticker is None or price is None or timestamp_str is None:
+                    # Epoch milliseconds avoid parsing a string per tick
+                    if update.t is not None:
+                        timestamp = datetime.fromtimestamp(update.t / 1000.0)
+                    elif update.timestamp is not None:
+                        try:
+                            timestamp = datetime.fromisoformat(update.timestamp)
+                        except ValueError:
+                            logger.warning(f"Invalid timestamp format: {update.timestamp}")
+                            timestamp = datetime.now()
+                    else:
                         logger.warning("Received invalid price update, missing required fields")
                         continue
                     
-                    # Parse timestamp
-                    try:
-                        timestamp = datetime.fromisoformat(timestamp_str)
-                    except ValueError:
-                        logger.warning(f"Invalid timestamp format: {timestamp_str}")
-                        timestamp = datetime.now()
-                    
                     # Log price update
-                    logger.debug(f"Price update: {ticker} ${price:.2f}")
+                    logger.debug(f"Price update: {update.ticker} ${update.price:.2f}")
                     
                     # Process price update
-                    await self.price_monitor.process_price_update(ticker, price, timestamp)
-                    await self.data_processor.process_price_update(ticker, price, timestamp)
-                    
+                    await self.price_monitor.process_price_update(update.ticker, update.price, timestamp)
+                    await self.data_processor.process_price_update(update.ticker, update.price, timestamp)
+                    continue
+                
+                # Other frames are decoded generically
+                data = generic_decoder.decode(message)
+                
+                # Check message type
+                if data.get("type") == "price_update":
+                    logger.warning("Received invalid price update, missing required fields")
                 elif data.get("type") == "error":
                     logger.error(f"Server error: {data.get('message')}")
                 else:
                     logger.debug(f"Received message: {data}")
                     
-            except json.JSONDecodeError:
+            except msgspec.DecodeError:
                 logger.error(f"Failed to parse message: {message[:100]}...")
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
@@ -122,8 +173,17 @@ async def main():
         await client.connect()
     except KeyboardInterrupt:
         logger.info("Client stopped by user")
+    finally:
+        await client.close()
 
 if __name__ == "__main__":
+    # Use the libuv-based event loop when available (not on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -6,12 +6,45 @@ import sys
 import json
 import logging
 import importlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import pandas as pd
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _phase_lambda():
+    """Run the Lambda function locally against mock S3."""
+    try:
+        from cloud.test_lambda_locally import test_lambda_with_mock_s3
+        test_lambda_with_mock_s3()
+        return (2, "Lambda function", True, ["  ✓ Lambda function test succeeded"])
+    except Exception as e:
+        return (2, "Lambda function", False, [f"  ✗ Lambda function test failed: {e}"])
+
+def _phase_api(today):
+    """Call the FastAPI analysis endpoint if the app is running."""
+    try:
+        import requests
+        response = requests.get(f"http://localhost:8000/api/analyze-trades/{today}")
+        
+        if response.status_code == 200:
+            return (3, "FastAPI endpoint", True, [
+                f"  ✓ API endpoint test succeeded",
+                f"  Response: {json.dumps(response.json(), indent=2)}"
+            ])
+        return (3, "FastAPI endpoint", False, [
+            f"  ✗ API endpoint test failed: {response.status_code}",
+            f"  Response: {response.text}"
+        ])
+    except requests.exceptions.ConnectionError:
+        return (3, "FastAPI endpoint", False, [
+            "  ✗ API endpoint test failed: Could not connect to API server",
+            "    Make sure the API server is running (python app.py)"
+        ])
+    except Exception as e:
+        return (3, "FastAPI endpoint", False, [f"  ✗ API endpoint test failed: {e}"])
+
 def run_all_tests():
     """Run all AWS component tests."""
     print("\n===== AWS Integration Testing =====\n")
@@ -22,38 +55,23 @@ def run_all_tests():
     today = datetime.now().strftime("%Y-%m-%d")
     yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
     
-    mock_data_today = create_mock_trade_data_for_s3(today)
-    mock_data_yesterday = create_mock_trade_data_for_s3(yesterday)
+    mock_data = create_mock_trade_data_for_s3([today, yesterday])
+    records_per_day = mock_data.groupby("date").size()
     
-    print(f"  ✓ Created mock data for {today} with {len(mock_data_today)} records")
-    print(f"  ✓ Created mock data for {yesterday} with {len(mock_data_yesterday)} records")
+    for day in (today, yesterday):
+        print(f"  ✓ Created mock data for {day} with {records_per_day[day]} records")
     
-    # Test 2: Run Lambda function locally
-    print("\n2. Testing Lambda function with mock S3...")
-    try:
-        from cloud.test_lambda_locally import test_lambda_with_mock_s3
-        test_lambda_with_mock_s3()
-        print("  ✓ Lambda function test succeeded")
-    except Exception as e:
-        print(f"  ✗ Lambda function test failed: {e}")
+    # Tests 2-3 are independent and mostly wait on I/O, so run them concurrently
+    print("\n2-3. Testing Lambda function with mock S3 and FastAPI endpoint (requires app to be running)...")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(_phase_lambda), executor.submit(_phase_api, today)]
+        results = [future.result() for future in as_completed(futures)]
     
-    # Test 3: Test API endpoint if app is running
-    print("\n3. Testing FastAPI endpoint (requires app to be running)...")
-    try:
-        import requests
-        response = requests.get(f"http://localhost:8000/api/analyze-trades/{today}")
-        
-        if response.status_code == 200:
-            print(f"  ✓ API endpoint test succeeded")
-            print(f"  Response: {json.dumps(response.json(), indent=2)}")
-        else:
-            print(f"  ✗ API endpoint test failed: {response.status_code}")
-            print(f"  Response: {response.text}")
-    except requests.exceptions.ConnectionError:
-        print("  ✗ API endpoint test failed: Could not connect to API server")
-        print("    Make sure the API server is running (python app.py)")
-    except Exception as e:
-        print(f"  ✗ API endpoint test failed: {e}")
+    # Report in phase order regardless of completion order
+    for number, name, ok, lines in sorted(results):
+        print(f"\n{number}. {name}: {'passed' if ok else 'failed'}")
+        for line in lines:
+            print(line)
     
     print("\n===== AWS Integration Testing Complete =====")
 
@@ -9,6 +9,30 @@ import sys
 import requests
 from datetime import datetime
 
+async def _wait_ready(uri, timeout=10):
+    """
+    Poll the WebSocket server until it accepts connections.
+    
+    Args:
+        uri: WebSocket server URI to probe
+        timeout: Maximum number of seconds to wait
+        
+    Returns:
+        True if the server became reachable, False on timeout
+    """
+    backoff = 0.05
+    deadline = time.monotonic() + timeout
+    
+    while time.monotonic() < deadline:
+        try:
+            async with websockets.connect(uri, open_timeout=0.3):
+                return True
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 1.7, 0.5)
+    
+    return False
+
 async def test_websocket_server():
     """Test connecting to the WebSocket server and receiving messages."""
     print("\n1. Testing WebSocket server connection...")
@@ -32,7 +56,7 @@ async def test_websocket_server():
                         messages_received += 1
                         
                         # Check if the message has the required fields
-                        if all(key in data for key in ['ticker', 'price', 'timestamp']):
+                        if all(key in data for key in ['ticker', 'price']) and ('t' in data or 'timestamp' in data):
                             print(f"  ✓ Received update: {data['ticker']} ${data['price']}")
                         else:
                             print(f"  ✗ Received malformed message: {data}")
@@ -135,9 +159,12 @@ async def main():
     except Exception as e:
         print(f"✗ Error calling start-monitoring endpoint: {e}")
     
-    # Give the monitoring system time to start
-    print("\nWaiting 3 seconds for monitoring system to start...")
-    await asyncio.sleep(3)
+    # Wait until the monitoring system accepts connections
+    print("\nWaiting for monitoring system to start...")
+    if await _wait_ready("ws://localhost:8765"):
+        print("✓ Monitoring system is ready")
+    else:
+        print("✗ Monitoring system did not become ready in time")
     
     # Test the WebSocket server
     await test_websocket_server()
@@ -151,6 +178,13 @@ async def main():
     print("\n===== REAL-TIME TESTING COMPLETE =====")
 
 if __name__ == "__main__":
+    # Use the libuv-based event loop when available (not on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -3,15 +3,61 @@ Tests for the real-time data processing module.
 """
 import pytest
 import asyncio
-from datetime import datetime
+import importlib
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import MetaData
 from realtime.price_monitor import PriceMonitor
 from realtime.mock_websocket_server import STOCKS
+from realtime.schemas import PriceUpdate, msgpack_encoder
 
 @pytest.fixture
 def price_monitor():
     """Create PriceMonitor fixture."""
     return PriceMonitor(threshold_percent=1.0, window_seconds=10)
 
+class FakeSession:
+    """Stand-in database session that records inserted rows."""
+    def __init__(self, fail_commits=0):
+        self.fail_commits = fail_commits
+        self.inserted = []
+        self.pending = []
+        self.rollbacks = 0
+    
+    def execute(self, statement, records):
+        self.pending.append([dict(record) for record in records])
+    
+    def commit(self):
+        if self.fail_commits:
+            self.fail_commits -= 1
+            raise RuntimeError("database unavailable")
+        self.inserted.extend(self.pending)
+        self.pending = []
+    
+    def rollback(self):
+        self.rollbacks += 1
+        self.pending = []
+    
+    def close(self):
+        pass
+
+@pytest.fixture
+def data_processor_module(monkeypatch):
+    """Import the data processor without creating tables in the database."""
+    monkeypatch.setattr(MetaData, "create_all", lambda self, *args, **kwargs: None)
+    return importlib.import_module("realtime.data_processor")
+
+@pytest.fixture
+def fake_session(data_processor_module, monkeypatch):
+    """Route the data processor's database sessions to a FakeSession."""
+    session = FakeSession()
+    
+    def get_db_session():
+        yield session
+    
+    monkeypatch.setattr(data_processor_module, "get_db_session", get_db_session)
+    return session
+
 def test_price_monitor_initialization(price_monitor):
     """Test PriceMonitor initialization."""
     assert price_monitor.threshold_percent == 1.0
@@ -51,3 +97,200 @@ async def test_price_change_detection(price_monitor):
     
     # Check that both prices were recorded
     assert len(price_monitor.price_history[ticker]) == 2
+
+@pytest.mark.asyncio
+async def test_price_history_eviction(price_monitor):
+    """Test that prices older than the history window are evicted."""
+    ticker = "MSFT"
+    start = datetime.now()
+    
+    # Prices spaced beyond the 2x window kept by the monitor (20 seconds)
+    await price_monitor.process_price_update(ticker, 300.0, start)
+    await price_monitor.process_price_update(ticker, 300.1, start + timedelta(seconds=15))
+    await price_monitor.process_price_update(ticker, 300.2, start + timedelta(seconds=30))
+    
+    # Only the entries inside the window remain, oldest first
+    history = price_monitor.price_history[ticker]
+    assert [price for _, price in history] == [300.1, 300.2]
+
+def interval_bounds(session):
+    """Flatten the inserted rows to (start offset, end offset, data points) in seconds."""
+    origin = datetime(2025, 1, 1, 10, 0)
+    return [
+        ((record["start_time"] - origin).seconds, (record["end_time"] - origin).seconds, record["data_points"])
+        for insert in session.inserted for record in insert
+    ]
+
+# Ticks every 10 seconds with 1-minute intervals close at 0s, 60s and 120s,
+# and close() stores the 130-150s remainder
+EXPECTED_INTERVALS = [(0, 0, 1), (10, 60, 6), (70, 120, 6), (130, 150, 3)]
+
+@pytest.mark.asyncio
+async def test_data_processor_splits_intervals_within_a_batch(data_processor_module, fake_session):
+    """Test that one batch crossing several intervals stores one record per interval."""
+    processor = data_processor_module.DataProcessor(interval_minutes=1)
+    start = datetime(2025, 1, 1, 10, 0)
+    
+    # Queued before the flusher runs, so the 16 ticks arrive as a single batch
+    for i in range(16):
+        await processor.process_price_update("AAPL", 100.0 + i, start + timedelta(seconds=10 * i))
+    await processor.close()
+    
+    # The batch's three intervals go out in one INSERT, then close() writes the rest
+    assert [len(insert) for insert in fake_session.inserted] == [3, 1]
+    assert interval_bounds(fake_session) == EXPECTED_INTERVALS
+    assert [record["average_price"] for insert in fake_session.inserted for record in insert] == [100.0, 103.5, 109.5, 114.0]
+    assert processor.price_buffer["AAPL"] == []
+
+@pytest.mark.asyncio
+async def test_data_processor_batch_size_does_not_change_intervals(data_processor_module, fake_session):
+    """Test that small batches give the same interval boundaries as one large batch."""
+    processor = data_processor_module.DataProcessor(interval_minutes=1, batch_size=4)
+    start = datetime(2025, 1, 1, 10, 0)
+    
+    for i in range(16):
+        await processor.process_price_update("AAPL", 100.0 + i, start + timedelta(seconds=10 * i))
+    await processor.close()
+    
+    assert interval_bounds(fake_session) == EXPECTED_INTERVALS
+
+@pytest.mark.asyncio
+async def test_data_processor_keeps_buffer_after_failed_commit(data_processor_module, fake_session):
+    """Test that a failed commit keeps the prices so the next write includes them."""
+    fake_session.fail_commits = 1
+    processor = data_processor_module.DataProcessor(interval_minutes=1)
+    start = datetime(2025, 1, 1, 10, 0)
+    
+    await processor.process_price_update("MSFT", 300.0, start)
+    await processor.process_price_update("MSFT", 301.0, start + timedelta(seconds=1))
+    await asyncio.sleep(0.05)
+    
+    # The write was rolled back and nothing was marked as processed
+    assert fake_session.rollbacks == 1
+    assert fake_session.inserted == []
+    assert "MSFT" not in processor.last_processed
+    assert [ts for ts, _ in processor.price_buffer["MSFT"]] == [start, start + timedelta(seconds=1)]
+    
+    await processor.process_price_update("MSFT", 302.0, start + timedelta(seconds=2))
+    await processor.close()
+    
+    # The retry covers every buffered price, including the ones from the failed write
+    assert len(fake_session.inserted) == 1
+    record = fake_session.inserted[0][0]
+    assert record["data_points"] == 3
+    assert record["start_time"] == start
+    assert processor.last_processed["MSFT"] == start + timedelta(seconds=2)
+
+@pytest.mark.asyncio
+async def test_data_processor_restarts_dead_flusher(data_processor_module, fake_session):
+    """Test that a flusher task that has stopped is started again."""
+    processor = data_processor_module.DataProcessor()
+    await processor.process_price_update("NVDA", 450.0, datetime(2025, 1, 1, 10, 0))
+    await asyncio.sleep(0.05)
+    processor._flusher.cancel()
+    await asyncio.sleep(0)
+    
+    await processor.process_price_update("NVDA", 451.0, datetime(2025, 1, 1, 10, 1))
+    assert not processor._flusher.done()
+    await processor.close()
+    
+    assert sum(record["data_points"] for insert in fake_session.inserted for record in insert) == 2
+
+class RecordingProcessor:
+    """Stand-in for the price monitor and data processor."""
+    def __init__(self):
+        self.updates = []
+    
+    async def process_price_update(self, ticker, price, timestamp):
+        self.updates.append((ticker, price, timestamp))
+
+class FakeWebSocket:
+    """Async iterable over canned frames."""
+    def __init__(self, frames):
+        self.frames = frames
+    
+    async def __aiter__(self):
+        for frame in self.frames:
+            yield frame
+
+@pytest.fixture
+def websocket_client(data_processor_module):
+    """Create a WebSocketClient with recording monitor and processor."""
+    from realtime.websocket_client import WebSocketClient
+    client = WebSocketClient(reconnect_interval=1.0, max_backoff=4.0, stable_connection_seconds=30.0)
+    client.price_monitor = RecordingProcessor()
+    client.data_processor = RecordingProcessor()
+    return client
+
+@pytest.mark.asyncio
+async def test_process_messages_decodes_frames(websocket_client):
+    """Test JSON, MessagePack and legacy frames, and dropping unsubscribed tickers."""
+    epoch_ms = 1735725600000
+    frames = [
+        json.dumps({"type": "price_update", "ticker": "AAPL", "price": 150.5, "t": epoch_ms}),
+        msgpack_encoder.encode(PriceUpdate(type="price_update", ticker="META", price=320.25, t=epoch_ms)),
+        json.dumps({"type": "price_update", "ticker": "MSFT", "price": 301.0, "timestamp": "2025-01-01T10:00:00"}),
+        json.dumps({"type": "price_update", "ticker": "XXX", "price": 1.0, "t": epoch_ms}),
+        "not json",
+    ]
+    
+    await websocket_client._process_messages(FakeWebSocket(frames))
+    
+    expected = [
+        ("AAPL", 150.5, datetime.fromtimestamp(epoch_ms / 1000.0)),
+        ("META", 320.25, datetime.fromtimestamp(epoch_ms / 1000.0)),
+        ("MSFT", 301.0, datetime(2025, 1, 1, 10, 0)),
+    ]
+    assert websocket_client.price_monitor.updates == expected
+    assert websocket_client.data_processor.updates == expected
+
+class StopClient(Exception):
+    """Raised by the fake sleep to end the reconnect loop."""
+
+@pytest.mark.asyncio
+async def test_connect_backoff_grows_and_resets(websocket_client, monkeypatch):
+    """Test that the reconnect delay doubles up to the cap and resets after a stable connection."""
+    import realtime.websocket_client as websocket_client_module
+    
+    # Four refused connections, one that stays up past the stability window, one more refusal
+    outcomes = iter(["fail", "fail", "fail", "fail", "stable", "fail"])
+    loop = asyncio.get_running_loop()
+    real_time = loop.time
+    elapsed = [0.0]
+    monkeypatch.setattr(loop, "time", lambda: real_time() + elapsed[0])
+    
+    class FakeConnection:
+        def __init__(self, uri):
+            self.uri = uri
+            self.sent = []
+        
+        async def __aenter__(self):
+            if next(outcomes) == "fail":
+                raise OSError("connection refused")
+            return self
+        
+        async def __aexit__(self, *exc_info):
+            return False
+        
+        async def send(self, message):
+            self.sent.append(message)
+    
+    async def stay_connected(websocket):
+        elapsed[0] += 31.0
+    
+    delays = []
+    
+    async def fake_sleep(delay):
+        delays.append(delay)
+        if len(delays) == 6:
+            raise StopClient
+    
+    monkeypatch.setattr(websocket_client_module.websockets, "connect", FakeConnection)
+    monkeypatch.setattr(websocket_client_module.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(websocket_client_module.random, "uniform", lambda low, high: 0.0)
+    monkeypatch.setattr(websocket_client, "_process_messages", stay_connected)
+    
+    with pytest.raises(StopClient):
+        await websocket_client.connect()
+    
+    assert delays == [1.0, 2.0, 4.0, 4.0, 1.0, 2.0]
@@ -5,30 +5,28 @@ import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from trading.strategy import MovingAverageCrossoverStrategy
+from trading.strategy import MovingAverageCrossoverStrategy, rolling_mean
 from trading.backtester import Backtester
+from trading._backtest_loop import simulate_trades, summarize_returns
+from trading.data_generator import HistoricalDataGenerator
 
 @pytest.fixture
 def sample_price_data():
     """Create sample price data for testing."""
     # Create date range
-    dates = [datetime.now() - timedelta(days=i) for i in range(300, 0, -1)]
-    
-    # Create price series with a known pattern for testing
-    prices = [100.0]
-    for i in range(1, 300):
-        # Add some randomness but with a general trend
-        if i < 100:
-            # Downward trend
-            change = np.random.normal(-0.1, 0.5)
-        elif i < 200:
-            # Upward trend
-            change = np.random.normal(0.2, 0.5)
-        else:
-            # Sideways with slight upward bias
-            change = np.random.normal(0.05, 0.5)
-        
-        prices.append(max(0.1, prices[-1] * (1 + change/100)))
+    dates = pd.date_range(end=datetime.now() - timedelta(days=1), periods=300, freq='D')
+    
+    # Create price series with a known pattern for testing:
+    # downward trend, upward trend, then sideways with slight upward bias
+    changes = np.random.normal(0, 0.5, 299)
+    changes[:99] -= 0.1
+    changes[99:199] += 0.2
+    changes[199:] += 0.05
+    
+    prices = np.empty(300)
+    prices[0] = 100.0
+    prices[1:] = 100.0 * np.cumprod(1 + changes / 100)
+    prices = np.maximum(prices, 0.1)
     
     # Create DataFrame
     df = pd.DataFrame({
@@ -56,6 +54,38 @@ def test_moving_average_strategy(sample_price_data):
     # Check that there are some buy/sell signals
     assert signals['position'].abs().sum() > 0
 
+def test_generate_signals_matches_pandas(sample_price_data):
+    """Test generate_signals against a pandas rolling-mean crossover."""
+    strategy = MovingAverageCrossoverStrategy(short_window=10, long_window=30)
+    signals = strategy.generate_signals(sample_price_data)
+    
+    close = sample_price_data['close']
+    expected = pd.DataFrame({
+        'MA_10': close.rolling(window=10).mean(),
+        'MA_30': close.rolling(window=30).mean(),
+    })
+    expected['signal'] = (expected['MA_10'] > expected['MA_30']).astype(float)
+    expected['position'] = expected['signal'].diff()
+    expected = expected.dropna()
+    
+    assert signals.index.equals(expected.index)
+    np.testing.assert_allclose(signals['MA_10'], expected['MA_10'], rtol=1e-6)
+    np.testing.assert_allclose(signals['MA_30'], expected['MA_30'], rtol=1e-6)
+    np.testing.assert_array_equal(signals['signal'], expected['signal'])
+    np.testing.assert_array_equal(signals['position'], expected['position'])
+
+def test_generate_signals_with_missing_close(sample_price_data):
+    """Test that a missing close only drops the windows that contain it."""
+    data = sample_price_data.copy()
+    data.iloc[100, data.columns.get_loc('close')] = np.nan
+    
+    strategy = MovingAverageCrossoverStrategy(short_window=10, long_window=30)
+    signals = strategy.generate_signals(data)
+    
+    expected = data['close'].rolling(window=30).mean().dropna()
+    assert signals.index.equals(expected.index)
+    np.testing.assert_allclose(signals['MA_30'], expected, rtol=1e-6)
+
 def test_backtester(sample_price_data):
     """Test backtesting functionality."""
     # Create strategy and backtester
@@ -85,3 +115,80 @@ def test_backtester(sample_price_data):
     assert 'cash' in portfolio.columns
     assert 'total' in portfolio.columns
     assert 'returns' in portfolio.columns
+
+def test_strategy_backtest_round_trips():
+    """Test the strategy's own backtest on two hand-checked round trips."""
+    close = [10.0, 9.0, 8.0, 9.0, 10.0, 12.0, 11.0, 10.0, 9.0, 10.0, 12.0, 15.0, 14.0, 13.0]
+    data = pd.DataFrame({'close': close}, index=pd.date_range('2024-01-01', periods=len(close)))
+    strategy = MovingAverageCrossoverStrategy(short_window=2, long_window=3)
+    
+    portfolio = strategy.backtest(data, initial_capital=100.0)
+    
+    # Buy 10 shares at $10, sell at $10; then buy 8 at $12 with the running
+    # cash (leaving $4) and sell them at $13
+    np.testing.assert_array_equal(portfolio['position'], [0, 0, 1, 0, 0, -1, 0, 0, 1, 0, 0, -1])
+    np.testing.assert_allclose(portfolio['holdings'], [0, 0, 100, 120, 110, 0, 0, 0, 96, 120, 112, 0])
+    np.testing.assert_allclose(portfolio['cash'], [100, 100, 0, 0, 0, 100, 100, 100, 4, 4, 4, 108])
+    total = np.array([100, 100, 100, 120, 110, 100, 100, 100, 100, 124, 116, 108], dtype=float)
+    np.testing.assert_allclose(portfolio['total'], total)
+    np.testing.assert_allclose(portfolio['cumulative_returns'], total / 100.0 - 1, atol=1e-12)
+    
+    # The Backtester engine must agree with the strategy's own backtest
+    results = Backtester(strategy, data, initial_capital=100.0).run()['portfolio']
+    for column in ['holdings', 'cash', 'total', 'returns', 'cumulative_returns']:
+        np.testing.assert_allclose(results[column], portfolio[column], atol=1e-12)
+
+def test_simulate_trades_kernel():
+    """Test the compiled trade-simulation loop on a hand-checked series."""
+    close = np.array([10.0, 20.0, 25.0, 40.0, 30.0])
+    position = np.array([0.0, 1.0, 0.0, -1.0, 0.0])
+    
+    holdings, cash, total, returns = simulate_trades(close, position, 100.0)
+    
+    # Buy 5 shares at $20, sell them at $40
+    np.testing.assert_allclose(holdings, [0.0, 100.0, 125.0, 0.0, 0.0])
+    np.testing.assert_allclose(cash, [100.0, 0.0, 0.0, 200.0, 200.0])
+    np.testing.assert_allclose(total, [100.0, 100.0, 125.0, 200.0, 200.0])
+    np.testing.assert_allclose(returns, [0.0, 0.0, 0.25, 0.6, 0.0])
+
+def test_summarize_returns_matches_numpy():
+    """Test the one-pass return statistics against plain NumPy."""
+    returns = np.array([0.0, 0.25, 0.6, -0.5, 0.1])
+    
+    cum_returns, drawdown, std, max_drawdown = summarize_returns(returns)
+    
+    expected_cum = np.cumprod(1 + returns)
+    expected_drawdown = expected_cum / np.maximum.accumulate(expected_cum) - 1
+    np.testing.assert_allclose(cum_returns, expected_cum - 1, atol=1e-12)
+    np.testing.assert_allclose(drawdown, expected_drawdown, atol=1e-12)
+    assert std == pytest.approx(returns.std(ddof=1))
+    assert max_drawdown == pytest.approx(-0.5)
+
+def test_summarize_returns_keeps_small_returns_precise():
+    """Test that cumulative returns near zero are not lost to cancellation."""
+    returns = np.full(5, 1e-12)
+    
+    cum_returns, _, _, _ = summarize_returns(returns)
+    
+    np.testing.assert_allclose(cum_returns, np.cumsum(returns), rtol=1e-9)
+
+def test_rolling_mean_matches_pandas(sample_price_data):
+    """Test the running-sum moving average against pandas rolling."""
+    close = sample_price_data['close']
+    
+    expected = close.rolling(window=30).mean().to_numpy()
+    result = rolling_mean(close.to_numpy(), 30)
+    
+    np.testing.assert_allclose(result, expected, equal_nan=True)
+
+def test_seeded_generation_matches_across_worker_counts():
+    """Test that a seed gives the same data sequentially and in a pool."""
+    end_date = datetime(2024, 1, 1)
+    start_date = end_date - timedelta(days=120)
+    tickers = ["AAPL", "MSFT"]
+    
+    sequential = HistoricalDataGenerator(start_date, end_date, tickers, seed=42).generate_all_data(max_workers=1)
+    pooled = HistoricalDataGenerator(start_date, end_date, tickers, seed=42).generate_all_data(max_workers=2)
+    
+    for ticker in tickers:
+        pd.testing.assert_frame_equal(sequential[ticker], pooled[ticker])
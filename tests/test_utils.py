@@ -0,0 +1,58 @@
+"""
+Tests for the shared helper functions.
+"""
+import pytest
+import pandas as pd
+from utils.helpers import save_dataframe, read_csv_to_dataframe
+
+@pytest.fixture
+def prices():
+    """Create a small price frame."""
+    return pd.DataFrame({
+        'ticker': ['AAPL', 'MSFT', 'AAPL', 'MSFT', 'NVDA', 'NVDA'],
+        'close': [150.0, 300.0, 151.5, 299.0, 450.0, 455.5],
+        'volume': [100, 200, 150, 250, 300, 350],
+    })
+
+@pytest.mark.parametrize("extension, reader", [
+    (".parquet", pd.read_parquet),
+    (".feather", pd.read_feather),
+])
+def test_save_dataframe_round_trips(prices, tmp_path, extension, reader):
+    """Test that the format is picked from the extension and the data survives."""
+    path = tmp_path / f"prices{extension}"
+    
+    assert save_dataframe(prices, str(path))
+    
+    pd.testing.assert_frame_equal(reader(path), prices)
+
+@pytest.mark.parametrize("extension, reader", [
+    (".parquet", pd.read_parquet),
+    (".feather", pd.read_feather),
+])
+def test_save_dataframe_sliced_and_filtered(prices, tmp_path, extension, reader):
+    """Test frames whose index is no longer the default RangeIndex."""
+    sliced = prices.iloc[2:]
+    filtered = prices[prices['ticker'] == 'MSFT']
+    
+    for name, frame in [("sliced", sliced), ("filtered", filtered)]:
+        path = tmp_path / f"{name}{extension}"
+        assert save_dataframe(frame, str(path))
+        
+        saved = reader(path)
+        pd.testing.assert_frame_equal(
+            saved[list(frame.columns)].reset_index(drop=True),
+            frame.reset_index(drop=True),
+        )
+
+def test_save_dataframe_csv_fallback(prices, tmp_path):
+    """Test that unknown extensions are written as CSV in a new directory."""
+    path = tmp_path / "out" / "prices.txt"
+    
+    assert save_dataframe(prices.iloc[1:], str(path))
+    
+    pd.testing.assert_frame_equal(read_csv_to_dataframe(str(path)), prices.iloc[1:].reset_index(drop=True))
+
+def test_save_dataframe_unsupported_format(prices, tmp_path):
+    """Test that an unknown explicit format is reported as a failure."""
+    assert not save_dataframe(prices, str(tmp_path / "prices.bin"), format='hdf5')
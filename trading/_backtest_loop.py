@@ -0,0 +1,96 @@
+"""
+Compiled trade-simulation loop used by the backtester.
+"""
+import numpy as np
+from ._njit import njit
+
+# Explicit signature so the kernel is compiled (or loaded from cache) at import
+@njit("UniTuple(float64[:], 4)(float64[:], float64[:], float64)", cache=True)
+def simulate_trades(close, position_sig, initial_capital):
+    """
+    Simulate an all-in / all-out strategy over a series of signals.
+    
+    Args:
+        close: Closing prices
+        position_sig: Crossover signals (1.0: buy, -1.0: sell, otherwise hold)
+        initial_capital: Starting cash
+        
+    Returns:
+        Tuple of (holdings, cash, total, returns) arrays
+    """
+    n = close.shape[0]
+    holdings = np.empty(n, dtype=np.float64)
+    cash_arr = np.empty(n, dtype=np.float64)
+    total = np.empty(n, dtype=np.float64)
+    returns = np.zeros(n, dtype=np.float64)
+    
+    cash = initial_capital
+    shares = 0.0
+    
+    for i in range(n):
+        price = close[i]
+        sig = position_sig[i]
+        
+        # Branchless update: the selects compile to conditional moves, so
+        # sparse, irregular crossovers don't cause branch mispredictions
+        buy = sig == 1.0
+        sell = (sig == -1.0) & (shares > 0)
+        shares_to_buy = float(int(cash / price)) if buy else 0.0  # All available cash
+        proceeds = shares * price if sell else 0.0  # All shares
+        
+        shares += shares_to_buy - (shares if sell else 0.0)
+        cash += proceeds - shares_to_buy * price
+        
+        holdings[i] = shares * price
+        cash_arr[i] = cash
+        total[i] = holdings[i] + cash
+        
+        if i > 0:
+            returns[i] = total[i] / total[i - 1] - 1
+    
+    return holdings, cash_arr, total, returns
+
+@njit("Tuple((float64[:], float64[:], float64, float64))(float64[:])", cache=True)
+def summarize_returns(returns):
+    """
+    Compute cumulative growth, drawdowns and summary statistics in one pass.
+    
+    Growth is accumulated in log space, which loses less precision than a
+    running product over long histories, and cumulative returns are taken
+    with expm1 so returns near zero keep their precision.
+    
+    Args:
+        returns: Daily returns
+        
+    Returns:
+        Tuple of (cumulative returns, drawdown, sample standard deviation
+        of returns, maximum drawdown)
+    """
+    n = returns.shape[0]
+    cum_returns = np.empty(n, dtype=np.float64)
+    drawdown = np.empty(n, dtype=np.float64)
+    
+    log_growth = 0.0
+    running_max = -np.inf
+    max_drawdown = 0.0
+    
+    # Welford's running mean and sum of squared deviations
+    mean = 0.0
+    m2 = 0.0
+    
+    for i in range(n):
+        r = returns[i]
+        
+        log_growth += np.log1p(r)
+        cum_returns[i] = np.expm1(log_growth)
+        growth = np.exp(log_growth)
+        running_max = max(running_max, growth)
+        drawdown[i] = growth / running_max - 1.0
+        max_drawdown = min(max_drawdown, drawdown[i])
+        
+        delta = r - mean
+        mean += delta / (i + 1)
+        m2 += delta * (r - mean)
+    
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    return cum_returns, drawdown, std, max_drawdown
@@ -0,0 +1,21 @@
+"""
+Ahead-of-time build of the strategy's Numba kernels.
+
+Run ``python -m trading._kernels_build`` (e.g. at install time) to compile
+the ``trading.trading_kernels`` extension module. The strategy imports it
+when present and otherwise falls back to JIT compilation, then to plain
+Python if Numba is not installed.
+"""
+import os
+from numba.pycc import CC
+from trading import strategy
+
+cc = CC('trading_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Export the strategy's own kernel sources so the two paths cannot drift apart
+cc.export('rolling_mean', 'f8[:](f8[:], i8)')(strategy._rolling_mean.py_func)
+cc.export('reduce_events', 'UniTuple(f8[:], 2)(f8[:], f8[:], f8)')(strategy._reduce_events.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -4,6 +4,7 @@ Backtesting engine for trading strategies.
 import pandas as pd
 import numpy as np
 from utils.logger import get_logger
+from ._backtest_loop import simulate_trades, summarize_returns
 
 logger = get_logger(__name__)
 
@@ -34,14 +35,11 @@ class Backtester:
         # Generate signals using the strategy
         signals = self.strategy.generate_signals(self.data)
         
-        # Initialize portfolio metrics
-        portfolio = self._initialize_portfolio(signals)
-        
         # Simulate trading based on signals
-        portfolio = self._simulate_trades(portfolio)
+        portfolio, stats = self._simulate_trades(signals)
         
         # Calculate performance metrics
-        metrics = self._calculate_metrics(portfolio)
+        metrics = self._calculate_metrics(portfolio, stats)
         
         self.results = {
             'portfolio': portfolio,
@@ -52,95 +50,69 @@ class Backtester:
         
         return self.results
         
-    def _initialize_portfolio(self, signals):
-        """Initialize portfolio metrics DataFrame."""
-        portfolio = signals.copy()
-        portfolio['holdings'] = 0.0
-        portfolio['cash'] = self.initial_capital
-        portfolio['total'] = self.initial_capital
-        portfolio['returns'] = 0.0
-        return portfolio
-        
-    def _simulate_trades(self, portfolio):
-        """Simulate trades based on signals."""
-        position = 0  # Number of shares held
-        
-        for i in range(len(portfolio)):
-            price = portfolio['close'].iloc[i]
-            
-            # Buy signal (crossover happened)
-            if portfolio['position'].iloc[i] == 1.0:
-                # Calculate number of shares to buy with all available cash
-                shares_to_buy = int(portfolio['cash'].iloc[i-1] / price) if i > 0 else int(self.initial_capital / price)
-                cost = shares_to_buy * price
-                
-                position += shares_to_buy
-                portfolio.loc[portfolio.index[i], 'holdings'] = position * price
-                portfolio.loc[portfolio.index[i], 'cash'] = portfolio['cash'].iloc[i-1] - cost if i > 0 else self.initial_capital - cost
-                
-                logger.debug(f"BUY: {shares_to_buy} shares at ${price:.2f}")
-                
-            # Sell signal (crossover happened)
-            elif portfolio['position'].iloc[i] == -1.0 and position > 0:
-                # Sell all shares
-                proceeds = position * price
-                
-                logger.debug(f"SELL: {position} shares at ${price:.2f}")
-                
-                position = 0
-                portfolio.loc[portfolio.index[i], 'holdings'] = 0
-                portfolio.loc[portfolio.index[i], 'cash'] = portfolio['cash'].iloc[i-1] + proceeds if i > 0 else self.initial_capital + proceeds
-                
-            # Hold position
-            else:
-                portfolio.loc[portfolio.index[i], 'holdings'] = position * price
-                portfolio.loc[portfolio.index[i], 'cash'] = portfolio['cash'].iloc[i-1] if i > 0 else self.initial_capital
-            
-            # Update total value and calculate returns
-            portfolio.loc[portfolio.index[i], 'total'] = portfolio['holdings'].iloc[i] + portfolio['cash'].iloc[i]
-            
-            if i > 0:
-                daily_return = portfolio['total'].iloc[i] / portfolio['total'].iloc[i-1] - 1
-                portfolio.loc[portfolio.index[i], 'returns'] = daily_return
-        
-        # Calculate cumulative returns
-        portfolio['cumulative_returns'] = (1 + portfolio['returns']).cumprod() - 1
-        
-        return portfolio
+    def _simulate_trades(self, signals):
+        """
+        Simulate trades based on signals and build the portfolio DataFrame.
+        
+        Returns:
+            Tuple of (portfolio DataFrame, (return std, max drawdown))
+        """
+        # The path-dependent loop runs in a compiled kernel over plain arrays
+        close = np.ascontiguousarray(signals['close'].to_numpy(dtype=np.float64, copy=False))
+        position_sig = np.ascontiguousarray(signals['position'].to_numpy(dtype=np.float64, copy=False))
+        
+        holdings, cash, total, returns = simulate_trades(close, position_sig, float(self.initial_capital))
+        
+        # Cumulative returns, drawdowns and summary statistics in one pass,
+        # reused by metrics and reports
+        cum_returns, drawdown, returns_std, max_drawdown = summarize_returns(returns)
+        
+        # The signals frame is freshly built by the strategy, so the new
+        # columns are attached in one concat without copying it first
+        results = pd.DataFrame({
+            'holdings': holdings,
+            'cash': cash,
+            'total': total,
+            'returns': returns,
+            'cumulative_returns': cum_returns,
+            '_drawdown': drawdown,
+        }, index=signals.index)
+        portfolio = pd.concat([signals, results], axis=1, copy=False)
+        return portfolio, (returns_std, max_drawdown)
     
-    def _calculate_metrics(self, portfolio):
+    def _calculate_metrics(self, portfolio, stats):
         """Calculate performance metrics for the portfolio."""
+        returns_std, max_drawdown = stats
+        
+        # Read each column once as an array
+        cum_returns = portfolio['cumulative_returns'].to_numpy()
+        total = portfolio['total'].to_numpy()
+        position_sig = portfolio['position'].to_numpy()
+        
         # Basic metrics
         start_date = portfolio.index[0]
         end_date = portfolio.index[-1]
         trading_days = len(portfolio)
         
         # Performance metrics
-        total_return = portfolio['cumulative_returns'].iloc[-1]
+        total_return = cum_returns[-1]
         annual_return = (1 + total_return) ** (252 / trading_days) - 1
         
-        # Risk metrics
-        daily_returns = portfolio['returns'].dropna()
-        volatility = daily_returns.std() * np.sqrt(252)  # Annualized volatility
+        # Risk metrics (sample std of daily returns, from _simulate_trades)
+        volatility = returns_std * np.sqrt(252)  # Annualized volatility
         
         # Sharpe ratio (using 0% risk-free rate for simplicity)
         sharpe_ratio = annual_return / volatility if volatility != 0 else 0
         
-        # Maximum drawdown
-        cum_returns = (1 + portfolio['returns']).cumprod()
-        running_max = cum_returns.cummax()
-        drawdowns = (cum_returns / running_max - 1)
-        max_drawdown = drawdowns.min()
-        
         # Count trades
-        buy_signals = (portfolio['position'] == 1.0).sum()
-        sell_signals = (portfolio['position'] == -1.0).sum()
+        buy_signals = np.count_nonzero(position_sig == 1.0)
+        sell_signals = np.count_nonzero(position_sig == -1.0)
         
         return {
             'start_date': start_date,
             'end_date': end_date,
             'initial_value': self.initial_capital,
-            'final_value': portfolio['total'].iloc[-1],
+            'final_value': total[-1],
             'total_return': total_return,
             'annual_return': annual_return,
             'volatility': volatility,
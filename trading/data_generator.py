@@ -5,14 +5,110 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime, timedelta
-import random
+from concurrent.futures import ProcessPoolExecutor
 from utils.logger import get_logger
 from utils.helpers import ensure_directory_exists
 
 logger = get_logger(__name__)
 
+# Default location of the merged sample data file
+SAMPLE_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'stock_data.csv')
+
+# Below this many generated rows, process-pool startup outweighs the work
+PARALLEL_MIN_ROWS = 1_000_000
+
+# Default starting prices and daily volatility per ticker
+TICKER_DEFAULT_PRICES = {
+    "AAPL": 150.0, "MSFT": 300.0, "AMZN": 130.0,
+    "GOOGL": 120.0, "META": 250.0, "TSLA": 200.0, "NVDA": 400.0
+}
+TICKER_DEFAULT_VOLATILITY = {
+    "AAPL": 0.015, "MSFT": 0.015, "AMZN": 0.02,
+    "GOOGL": 0.018, "META": 0.025, "TSLA": 0.035, "NVDA": 0.03
+}
+
+def _generate_price_series(ticker, days, end_date, rng, initial_price=None, volatility=None):
+    """
+    Generate a synthetic price series for a stock.
+    
+    Module-level so it pickles cheaply when sent to worker processes.
+    
+    Args:
+        ticker: Stock ticker symbol
+        days: Number of days to generate
+        end_date: Date of the last generated day
+        rng: numpy Generator used for every random draw
+        initial_price: Starting price (if None, a default is chosen)
+        volatility: Daily volatility factor (if None, a default is chosen)
+        
+    Returns:
+        DataFrame with date and OHLCV data
+    """
+    # Per-ticker defaults, looked up once per series
+    default_price = TICKER_DEFAULT_PRICES.get(ticker, 100.0)
+    base_volume = default_price * 100000  # Base volume proportional to price
+    
+    # Set initial price based on ticker if not provided
+    if initial_price is None:
+        initial_price = default_price
+    
+    # Set volatility based on ticker if not provided
+    if volatility is None:
+        volatility = TICKER_DEFAULT_VOLATILITY.get(ticker, 0.02)
+    
+    # Generate dates, oldest to newest, formatted in one pass
+    dates = pd.date_range(end=end_date, periods=days, freq='D').strftime('%Y-%m-%d').to_numpy()
+    
+    # Generate returns with some autocorrelation for price momentum
+    returns = rng.normal(0, volatility, days)
+    
+    # Add some trend patterns
+    # Bull market (uptrend)
+    if rng.random() < 0.6:  # 60% chance of uptrend
+        trend_days = rng.integers(20, 101)
+        trend_start = rng.integers(0, days - trend_days + 1)
+        trend_end = trend_start + trend_days
+        returns[trend_start:trend_end] += np.linspace(0, 0.001, trend_days)
+    
+    # Bear market (downtrend)
+    if rng.random() < 0.4:  # 40% chance of downtrend
+        trend_days = rng.integers(15, 61)
+        trend_start = rng.integers(0, days - trend_days + 1)
+        trend_end = trend_start + trend_days
+        returns[trend_start:trend_end] -= np.linspace(0, 0.002, trend_days)
+    
+    # Convert returns to prices in one vectorized pass
+    prices = initial_price * np.cumprod(1.0 + returns)
+    
+    # Generate open, high, low, close for every day at once
+    open_price = prices * (1 + rng.normal(0, 0.003, days))
+    high_price = np.maximum(open_price, prices) * (1 + np.abs(rng.normal(0, 0.005, days)))
+    low_price = np.minimum(open_price, prices) * (1 - np.abs(rng.normal(0, 0.005, days)))
+    
+    # Generate volume
+    volume = (base_volume * (1 + rng.normal(0, 0.3, days))).astype(np.int64)
+    
+    return pd.DataFrame({
+        'date': dates,
+        'open': np.round(open_price, 2),
+        'high': np.round(high_price, 2),
+        'low': np.round(low_price, 2),
+        'close': np.round(prices, 2),
+        'volume': volume
+    })
+
+def _generate_price_series_seeded(ticker, days, end_date, seed):
+    """
+    Build a series from its own Generator.
+    
+    Each ticker gets its own SeedSequence child so that the streams are
+    independent of each other and of the parent. Module-level so it can also
+    be used as a worker entry point.
+    """
+    return _generate_price_series(ticker, days, end_date, np.random.default_rng(seed))
+
 class HistoricalDataGenerator:
-    def __init__(self, start_date=None, end_date=None, tickers=None):
+    def __init__(self, start_date=None, end_date=None, tickers=None, seed=None):
         """
         Initialize the historical data generator.
         
@@ -20,12 +116,15 @@ class HistoricalDataGenerator:
             start_date: Start date for the data (defaults to 2 years ago)
             end_date: End date for the data (defaults to today)
             tickers: List of stock tickers (defaults to popular tech stocks)
+            seed: Seed for reproducible data (defaults to fresh OS entropy)
         """
         self.start_date = start_date or (datetime.now() - timedelta(days=365*2))
         self.end_date = end_date or datetime.now()
         self.tickers = tickers or ["AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "NVDA"]
         self.data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
         ensure_directory_exists(self.data_dir)
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self._seed_sequence)
         
     def generate_price_series(self, ticker, days, initial_price=None, volatility=None):
         """
@@ -40,93 +139,55 @@ class HistoricalDataGenerator:
         Returns:
             DataFrame with date and OHLCV data
         """
-        # Set initial price based on ticker if not provided
-        if initial_price is None:
-            ticker_defaults = {
-                "AAPL": 150.0, "MSFT": 300.0, "AMZN": 130.0,
-                "GOOGL": 120.0, "META": 250.0, "TSLA": 200.0, "NVDA": 400.0
-            }
-            initial_price = ticker_defaults.get(ticker, 100.0)
-        
-        # Set volatility based on ticker if not provided
-        if volatility is None:
-            ticker_volatility = {
-                "AAPL": 0.015, "MSFT": 0.015, "AMZN": 0.02,
-                "GOOGL": 0.018, "META": 0.025, "TSLA": 0.035, "NVDA": 0.03
-            }
-            volatility = ticker_volatility.get(ticker, 0.02)
-        
-        # Generate dates
-        date_range = [self.end_date - timedelta(days=i) for i in range(days)]
-        date_range.reverse()  # Oldest to newest
-        
-        # Generate returns with some autocorrelation for price momentum
-        returns = np.random.normal(0, volatility, days)
-        
-        # Add some trend patterns
-        # Bull market (uptrend)
-        if random.random() < 0.6:  # 60% chance of uptrend
-            trend_days = random.randint(20, 100)
-            trend_start = random.randint(0, days - trend_days)
-            trend_end = trend_start + trend_days
-            returns[trend_start:trend_end] += np.linspace(0, 0.001, trend_days)
-        
-        # Bear market (downtrend)
-        if random.random() < 0.4:  # 40% chance of downtrend
-            trend_days = random.randint(15, 60)
-            trend_start = random.randint(0, days - trend_days)
-            trend_end = trend_start + trend_days
-            returns[trend_start:trend_end] -= np.linspace(0, 0.002, trend_days)
-        
-        # Convert returns to prices
-        prices = [initial_price]
-        for ret in returns:
-            prices.append(prices[-1] * (1 + ret))
-        prices = prices[1:]  # Remove the initial seed
-        
-        # Generate OHLCV data
-        data = []
-        for i, date in enumerate(date_range):
-            price = prices[i]
-            
-            # Generate open, high, low, close for the day
-            daily_volatility = price * volatility * 0.5
-            
-            open_price = price * (1 + np.random.normal(0, 0.003))
-            high_price = max(open_price, price) * (1 + abs(np.random.normal(0, 0.005)))
-            low_price = min(open_price, price) * (1 - abs(np.random.normal(0, 0.005)))
-            close_price = price
-            
-            # Generate volume
-            base_volume = ticker_defaults.get(ticker, 100) * 100000  # Base volume proportional to price
-            volume = int(base_volume * (1 + np.random.normal(0, 0.3)))
-            
-            data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'open': round(open_price, 2),
-                'high': round(high_price, 2),
-                'low': round(low_price, 2),
-                'close': round(close_price, 2),
-                'volume': volume
-            })
-        
-        return pd.DataFrame(data)
-    
-    def generate_all_data(self):
+        return _generate_price_series(ticker, days, self.end_date, self.rng, initial_price, volatility)
+    
+    def generate_all_data(self, max_workers=None):
         """
         Generate historical price data for all tickers.
         
+        Tickers are independent and can be generated in worker processes,
+        but a vectorized series takes only a millisecond or two, so starting
+        a process pool (tens of milliseconds) costs more than it saves for
+        typical sizes. By default the pool is therefore only used once the
+        total number of rows reaches PARALLEL_MIN_ROWS.
+        
+        Args:
+            max_workers: Number of worker processes (defaults to sequential
+                below PARALLEL_MIN_ROWS, otherwise one per ticker capped at
+                the CPU count; 1 generates sequentially)
+        
         Returns:
             Dictionary mapping ticker symbols to DataFrames with price data
         """
         days = (self.end_date - self.start_date).days
-        all_data = {}
         
-        for ticker in self.tickers:
-            logger.info(f"Generating historical data for {ticker}")
-            all_data[ticker] = self.generate_price_series(ticker, days)
+        if max_workers is None:
+            if days * len(self.tickers) < PARALLEL_MIN_ROWS:
+                max_workers = 1
+            else:
+                max_workers = min(len(self.tickers), os.cpu_count() or 1)
+        
+        # Independent stream per ticker, derived from this generator's seed;
+        # used on both paths so a seed gives the same data however it runs
+        seeds = self._seed_sequence.spawn(len(self.tickers))
+        
+        if max_workers <= 1:
+            all_data = {}
+            for ticker, seed in zip(self.tickers, seeds):
+                logger.info(f"Generating historical data for {ticker}")
+                all_data[ticker] = _generate_price_series_seeded(ticker, days, self.end_date, seed)
+            return all_data
         
-        return all_data
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for ticker, seed in zip(self.tickers, seeds):
+                logger.info(f"Generating historical data for {ticker}")
+                futures[ticker] = executor.submit(
+                    _generate_price_series_seeded, ticker, days, self.end_date, seed
+                )
+            
+            # Keep the ticker order stable regardless of completion order
+            return {ticker: future.result() for ticker, future in futures.items()}
     
     def save_to_csv(self, data=None, directory=None):
         """
@@ -154,6 +215,37 @@ class HistoricalDataGenerator:
         
         return file_paths
     
+    def save_to_parquet(self, data=None, directory=None, compression='snappy'):
+        """
+        Save generated data to Parquet files.
+        
+        Parquet is written and read back by Arrow's C++ code, so it is much
+        faster than CSV for data that is only consumed by this package.
+        Requires pyarrow.
+        
+        Args:
+            data: Dictionary of DataFrames (if None, generates new data)
+            directory: Directory to save files (if None, uses default)
+            compression: Parquet compression codec
+            
+        Returns:
+            Dictionary mapping ticker symbols to file paths
+        """
+        if data is None:
+            data = self.generate_all_data()
+        
+        directory = directory or self.data_dir
+        ensure_directory_exists(directory)
+        
+        file_paths = {}
+        for ticker, df in data.items():
+            file_path = os.path.join(directory, f"{ticker}_historical.parquet")
+            df.to_parquet(file_path, engine='pyarrow', compression=compression, index=False)
+            file_paths[ticker] = file_path
+            logger.info(f"Saved historical data for {ticker} to {file_path}")
+        
+        return file_paths
+    
     def generate_merged_file(self, data=None, filename="stock_data.csv"):
         """
         Generate a merged CSV file containing data for multiple stocks.
@@ -168,22 +260,18 @@ class HistoricalDataGenerator:
         if data is None:
             data = self.generate_all_data()
         
-        # Add ticker column to each DataFrame
-        merged_data = []
-        for ticker, df in data.items():
-            df_copy = df.copy()
-            df_copy['ticker'] = ticker
-            merged_data.append(df_copy)
-        
-        # Combine all DataFrames
-        merged_df = pd.concat(merged_data)
+        # Combine all DataFrames with a ticker column, without extra copies
+        merged_df = pd.concat(
+            [df.assign(ticker=ticker) for ticker, df in data.items()],
+            ignore_index=True, copy=False
+        )
         
         # Sort by date and ticker
-        merged_df = merged_df.sort_values(['date', 'ticker'])
+        merged_df.sort_values(['date', 'ticker'], ignore_index=True, inplace=True, kind='stable')
         
-        # Save to CSV
+        # Save to CSV in chunks to keep peak memory bounded
         filepath = os.path.join(self.data_dir, filename)
-        merged_df.to_csv(filepath, index=False)
+        merged_df.to_csv(filepath, index=False, chunksize=50000)
         logger.info(f"Saved merged historical data to {filepath}")
         
         return filepath
@@ -200,5 +288,27 @@ def generate_sample_data():
     logger.info(f"Sample data generated at {filepath}")
     return filepath
 
+def ensure_sample_data(data_file=SAMPLE_DATA_PATH):
+    """
+    Generate the sample data file on first use if it does not exist yet.
+    
+    Generation is skipped when the TRADING_SKIP_SAMPLE_GEN environment
+    variable is set.
+    
+    Args:
+        data_file: Path of the sample data file to check
+        
+    Returns:
+        Path to the sample data file
+    """
+    if os.getenv('TRADING_SKIP_SAMPLE_GEN'):
+        return data_file
+    
+    try:
+        os.stat(data_file)
+    except FileNotFoundError:
+        data_file = generate_sample_data()
+    return data_file
+
 if __name__ == "__main__":
     generate_sample_data()
@@ -2,14 +2,139 @@
 Generate reports from trading strategy backtest results.
 """
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 from io import BytesIO
 import base64
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Charts are rendered at a reduced DPI and with at most this many points per line
+CHART_DPI = 80
+MAX_CHART_POINTS = 2000
+
+# matplotlib is imported on first chart so backtest-only users skip its import cost
+def _new_figure(figsize):
+    """
+    Create a standalone figure with a single set of axes.
+    
+    The figure is not registered with pyplot and does not touch the global
+    backend, so report charts never disturb the caller's own figures.
+    
+    Args:
+        figsize: Figure size in inches as (width, height)
+        
+    Returns:
+        Tuple of (figure, axes)
+    """
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    return fig, fig.add_subplot()
+
+# Report skeleton: static head and tail around a metrics template that is
+# filled with a single format_map pass
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Trading Strategy Backtest Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .container { max-width: 1000px; margin: 0 auto; }
+        .header { text-align: center; margin-bottom: 20px; }
+        .summary { background-color: #f5f5f5; padding: 15px; border-radius: 5px; }
+        .metrics { display: grid; grid-template-columns: repeat(3, 1fr); gap: 10px; margin: 15px 0; }
+        .metric-card { background-color: #f9f9f9; padding: 10px; border-radius: 5px; }
+        .chart { margin: 20px 0; text-align: center; }
+        table { width: 100%; border-collapse: collapse; margin: 15px 0; }
+        th, td { padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }
+        th { background-color: #f2f2f2; }
+    </style>
+</head>
+<body>
+    <div class="container">
+"""
+
+_HTML_METRICS_TEMPLATE = """        <div class="header">
+            <h1>Trading Strategy Backtest Report</h1>
+            <p>Period: {start_date} to {end_date}</p>
+        </div>
+        
+        <div class="summary">
+            <h2>Performance Summary</h2>
+            <div class="metrics">
+                <div class="metric-card">
+                    <h3>Initial Capital</h3>
+                    <p>${initial_value:,.2f}</p>
+                </div>
+                <div class="metric-card">
+                    <h3>Final Value</h3>
+                    <p>${final_value:,.2f}</p>
+                </div>
+                <div class="metric-card">
+                    <h3>Total Return</h3>
+                    <p>{total_return:.2%}</p>
+                </div>
+                <div class="metric-card">
+                    <h3>Annual Return</h3>
+                    <p>{annual_return:.2%}</p>
+                </div>
+                <div class="metric-card">
+                    <h3>Volatility</h3>
+                    <p>{volatility:.2%}</p>
+                </div>
+                <div class="metric-card">
+                    <h3>Sharpe Ratio</h3>
+                    <p>{sharpe_ratio:.2f}</p>
+                </div>
+                <div class="metric-card">
+                    <h3>Max Drawdown</h3>
+                    <p>{max_drawdown:.2%}</p>
+                </div>
+                <div class="metric-card">
+                    <h3>Number of Trades</h3>
+                    <p>{num_trades}</p>
+                </div>
+            </div>
+        </div>
+        
+        <div class="chart">
+            <h2>Portfolio Performance</h2>
+            <img src="data:image/png;base64,{performance_chart}" alt="Portfolio Performance Chart" style="max-width:100%;">
+        </div>
+        
+        <div class="chart">
+            <h2>Drawdown Analysis</h2>
+            <img src="data:image/png;base64,{drawdown_chart}" alt="Drawdown Chart" style="max-width:100%;">
+        </div>
+        
+        <div class="trades">
+            <h2>Trade Summary</h2>
+            <table>
+                <tr>
+                    <th>Metric</th>
+                    <th>Value</th>
+                </tr>
+                <tr>
+                    <td>Buy Signals</td>
+                    <td>{buy_signals}</td>
+                </tr>
+                <tr>
+                    <td>Sell Signals</td>
+                    <td>{sell_signals}</td>
+                </tr>
+                <tr>
+                    <td>Total Trades</td>
+                    <td>{num_trades}</td>
+                </tr>
+            </table>
+        </div>
+"""
+
+_HTML_TAIL = """    </div>
+</body>
+</html>
+"""
+
 class ReportGenerator:
     def __init__(self, backtest_results):
         """
@@ -21,6 +146,7 @@ class ReportGenerator:
         self.results = backtest_results
         self.portfolio = backtest_results['portfolio']
         self.metrics = backtest_results['metrics']
+        self._charts = None
         
     def generate_html_report(self):
         """
@@ -29,111 +155,46 @@ class ReportGenerator:
         Returns:
             String containing HTML report
         """
-        # Generate charts
-        performance_chart = self._generate_performance_chart()
-        drawdown_chart = self._generate_drawdown_chart()
-        
-        # Create HTML content
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Trading Strategy Backtest Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .container {{ max-width: 1000px; margin: 0 auto; }}
-                .header {{ text-align: center; margin-bottom: 20px; }}
-                .summary {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; }}
-                .metrics {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: 10px; margin: 15px 0; }}
-                .metric-card {{ background-color: #f9f9f9; padding: 10px; border-radius: 5px; }}
-                .chart {{ margin: 20px 0; text-align: center; }}
-                table {{ width: 100%; border-collapse: collapse; margin: 15px 0; }}
-                th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }}
-                th {{ background-color: #f2f2f2; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>Trading Strategy Backtest Report</h1>
-                    <p>Period: {self.metrics['start_date']} to {self.metrics['end_date']}</p>
-                </div>
-                
-                <div class="summary">
-                    <h2>Performance Summary</h2>
-                    <div class="metrics">
-                        <div class="metric-card">
-                            <h3>Initial Capital</h3>
-                            <p>${self.metrics['initial_value']:,.2f}</p>
-                        </div>
-                        <div class="metric-card">
-                            <h3>Final Value</h3>
-                            <p>${self.metrics['final_value']:,.2f}</p>
-                        </div>
-                        <div class="metric-card">
-                            <h3>Total Return</h3>
-                            <p>{self.metrics['total_return']:.2%}</p>
-                        </div>
-                        <div class="metric-card">
-                            <h3>Annual Return</h3>
-                            <p>{self.metrics['annual_return']:.2%}</p>
-                        </div>
-                        <div class="metric-card">
-                            <h3>Volatility</h3>
-                            <p>{self.metrics['volatility']:.2%}</p>
-                        </div>
-                        <div class="metric-card">
-                            <h3>Sharpe Ratio</h3>
-                            <p>{self.metrics['sharpe_ratio']:.2f}</p>
-                        </div>
-                        <div class="metric-card">
-                            <h3>Max Drawdown</h3>
-                            <p>{self.metrics['max_drawdown']:.2%}</p>
-                        </div>
-                        <div class="metric-card">
-                            <h3>Number of Trades</h3>
-                            <p>{self.metrics['num_trades']}</p>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="chart">
-                    <h2>Portfolio Performance</h2>
-                    <img src="data:image/png;base64,{performance_chart}" alt="Portfolio Performance Chart" style="max-width:100%;">
-                </div>
-                
-                <div class="chart">
-                    <h2>Drawdown Analysis</h2>
-                    <img src="data:image/png;base64,{drawdown_chart}" alt="Drawdown Chart" style="max-width:100%;">
-                </div>
-                
-                <div class="trades">
-                    <h2>Trade Summary</h2>
-                    <table>
-                        <tr>
-                            <th>Metric</th>
-                            <th>Value</th>
-                        </tr>
-                        <tr>
-                            <td>Buy Signals</td>
-                            <td>{self.metrics['buy_signals']}</td>
-                        </tr>
-                        <tr>
-                            <td>Sell Signals</td>
-                            <td>{self.metrics['sell_signals']}</td>
-                        </tr>
-                        <tr>
-                            <td>Total Trades</td>
-                            <td>{self.metrics['num_trades']}</td>
-                        </tr>
-                    </table>
-                </div>
-            </div>
-        </body>
-        </html>
+        performance_chart, drawdown_chart = self._chart_images()
+        
+        fields = dict(self.metrics, performance_chart=performance_chart, drawdown_chart=drawdown_chart)
+        return _HTML_HEAD + _HTML_METRICS_TEMPLATE.format_map(fields) + _HTML_TAIL
+    
+    def _chart_images(self):
+        """
+        Render both charts once and reuse them on later calls.
+        
+        Returns:
+            Tuple of base64 encoded (performance, drawdown) chart images
+        """
+        if self._charts is None:
+            self._charts = (self._generate_performance_chart(), self._generate_drawdown_chart())
+        return self._charts
+    
+    def _chart_data(self):
+        """
+        Get the portfolio rows to plot, downsampled for very long series.
+        
+        Returns:
+            DataFrame with at most about MAX_CHART_POINTS rows
+        """
+        step = max(1, len(self.portfolio) // MAX_CHART_POINTS)
+        return self.portfolio.iloc[::step]
+    
+    def _figure_to_base64(self, fig):
         """
+        Render a figure to PNG.
         
-        return html
+        Args:
+            fig: Matplotlib figure
+            
+        Returns:
+            Base64 encoded string of the chart image
+        """
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', dpi=CHART_DPI)
+        
+        return base64.b64encode(buffer.getvalue()).decode()
     
     def _generate_performance_chart(self):
         """
@@ -142,47 +203,48 @@ class ReportGenerator:
         Returns:
             Base64 encoded string of the chart image
         """
-        plt.figure(figsize=(10, 6))
+        fig, ax = _new_figure(figsize=(10, 6))
+        data = self._chart_data()
+        
+        # Plot from float32 copies; the PNG can't show float64 precision and
+        # the portfolio itself stays float64 for the metrics
+        dates = data.index
+        total = data['total'].to_numpy(dtype=np.float32)
+        close = data['close'].to_numpy(dtype=np.float32)
         
         # Plot portfolio value
-        plt.plot(self.portfolio.index, self.portfolio['total'], label='Portfolio Value', color='blue')
+        ax.plot(dates, total, label='Portfolio Value', color='blue')
         
-        # Add buy/sell markers
-        buy_signals = self.portfolio[self.portfolio['position'] == 1.0]
-        sell_signals = self.portfolio[self.portfolio['position'] == -1.0]
+        # Add buy/sell markers (sparse, so taken from the full series)
+        position = self.portfolio['position'].to_numpy()
+        buy_signals = self.portfolio[position == 1.0]
+        sell_signals = self.portfolio[position == -1.0]
         
-        plt.scatter(buy_signals.index, buy_signals['total'], color='green', marker='^', s=100, label='Buy')
-        plt.scatter(sell_signals.index, sell_signals['total'], color='red', marker='v', s=100, label='Sell')
+        ax.scatter(buy_signals.index, buy_signals['total'].to_numpy(dtype=np.float32),
+                   color='green', marker='^', s=100, label='Buy')
+        ax.scatter(sell_signals.index, sell_signals['total'].to_numpy(dtype=np.float32),
+                   color='red', marker='v', s=100, label='Sell')
         
         # Add price and moving averages
-        ax2 = plt.twinx()
-        ax2.plot(self.portfolio.index, self.portfolio['close'], alpha=0.3, color='gray', label='Price')
+        ax2 = ax.twinx()
+        ax2.plot(dates, close, alpha=0.3, color='gray', label='Price')
         
-        if 'MA_50' in self.portfolio.columns and 'MA_200' in self.portfolio.columns:
-            ax2.plot(self.portfolio.index, self.portfolio['MA_50'], alpha=0.5, color='orange', label='50-day MA')
-            ax2.plot(self.portfolio.index, self.portfolio['MA_200'], alpha=0.5, color='purple', label='200-day MA')
+        if 'MA_50' in data.columns and 'MA_200' in data.columns:
+            ax2.plot(dates, data['MA_50'].to_numpy(dtype=np.float32), alpha=0.5, color='orange', label='50-day MA')
+            ax2.plot(dates, data['MA_200'].to_numpy(dtype=np.float32), alpha=0.5, color='purple', label='200-day MA')
         
         # Customize the plot
-        plt.title('Portfolio Performance')
-        plt.xlabel('Date')
-        plt.ylabel('Portfolio Value ($)')
+        ax.set_title('Portfolio Performance')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Portfolio Value ($)')
         ax2.set_ylabel('Price ($)')
         
         # Add legends
-        lines1, labels1 = plt.gca().get_legend_handles_labels()
+        lines1, labels1 = ax.get_legend_handles_labels()
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax2.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
         
-        # Save chart to BytesIO
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        
-        # Encode to base64
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        plt.close()
-        
-        return image_base64
+        return self._figure_to_base64(fig)
     
     def _generate_drawdown_chart(self):
         """
@@ -191,38 +253,29 @@ class ReportGenerator:
         Returns:
             Base64 encoded string of the chart image
         """
-        plt.figure(figsize=(10, 6))
+        fig, ax = _new_figure(figsize=(10, 6))
         
-        # Calculate drawdowns
-        cum_returns = (1 + self.portfolio['returns']).cumprod()
-        running_max = cum_returns.cummax()
-        drawdowns = (cum_returns / running_max - 1) * 100  # In percentage
+        # Drawdowns are precomputed by the backtester
+        data = self._chart_data()
+        drawdowns = data['_drawdown'].to_numpy(dtype=np.float32) * 100  # In percentage
+        max_drawdown = self.portfolio['_drawdown'].min() * 100
         
         # Plot drawdowns
-        plt.fill_between(drawdowns.index, 0, drawdowns, color='red', alpha=0.3)
-        plt.plot(drawdowns.index, drawdowns, color='red', alpha=0.5)
+        ax.fill_between(data.index, 0, drawdowns, color='red', alpha=0.3)
+        ax.plot(data.index, drawdowns, color='red', alpha=0.5)
         
         # Customize the plot
-        plt.title('Portfolio Drawdown')
-        plt.xlabel('Date')
-        plt.ylabel('Drawdown (%)')
-        plt.grid(True, alpha=0.3)
+        ax.set_title('Portfolio Drawdown')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Drawdown (%)')
+        ax.grid(True, alpha=0.3)
         
         # Add maximum drawdown line
-        plt.axhline(y=drawdowns.min(), color='r', linestyle='--', 
-                   label=f'Maximum Drawdown: {drawdowns.min():.2f}%')
-        plt.legend()
-        
-        # Save chart to BytesIO
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        
-        # Encode to base64
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        plt.close()
+        ax.axhline(y=max_drawdown, color='r', linestyle='--', 
+                   label=f'Maximum Drawdown: {max_drawdown:.2f}%')
+        ax.legend()
         
-        return image_base64
+        return self._figure_to_base64(fig)
     
     def save_report_to_file(self, filename="backtest_report.html"):
         """
@@ -4,14 +4,19 @@ Run a trading strategy simulation using historical data.
 import os
 import pandas as pd
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from .strategy import MovingAverageCrossoverStrategy
 from .backtester import Backtester
 from .report_generator import ReportGenerator
+from .data_generator import ensure_sample_data
 from utils.logger import get_logger
-from utils.helpers import ensure_directory_exists
+from utils.helpers import ensure_directory_exists, CSV_ENGINE
 
 logger = get_logger(__name__)
 
+# Columns of the historical data file that the simulation reads
+SIMULATION_COLUMNS = ['date', 'ticker', 'close', 'price']
+
 def run_simulation(ticker="AAPL", data_file=None, short_window=50, long_window=200, 
                   initial_capital=100000.0, output_dir=None):
     """
@@ -28,19 +33,26 @@ def run_simulation(ticker="AAPL", data_file=None, short_window=50, long_window=2
     Returns:
         Path to the generated report file
     """
-    # Use default data file if not provided
+    # Use default data file if not provided, generating it on first use
     if data_file is None:
-        data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
-        data_file = os.path.join(data_dir, "stock_data.csv")
+        data_file = ensure_sample_data()
     
     # Check if file exists
     if not os.path.exists(data_file):
         logger.error(f"Data file not found: {data_file}")
         raise FileNotFoundError(f"Data file not found: {data_file}")
     
-    # Load and prepare data
+    # Load only the columns the simulation uses, parsing dates as we read
     logger.info(f"Loading data from {data_file}")
-    df = pd.read_csv(data_file)
+    header = pd.read_csv(data_file, nrows=0).columns
+    usecols = [column for column in SIMULATION_COLUMNS if column in header]
+    df = pd.read_csv(
+        data_file,
+        engine=CSV_ENGINE,
+        usecols=usecols,
+        dtype={'ticker': 'category'} if 'ticker' in usecols else None,
+        parse_dates=['date'] if 'date' in usecols else None
+    )
     
     # Filter by ticker
     if 'ticker' in df.columns:
@@ -52,7 +64,6 @@ def run_simulation(ticker="AAPL", data_file=None, short_window=50, long_window=2
         raise ValueError(f"No data found for ticker {ticker}")
     
     # Prepare data for backtesting
-    df['date'] = pd.to_datetime(df['date'])
     df.set_index('date', inplace=True)
     
     if 'close' not in df.columns and 'price' in df.columns:
@@ -87,6 +98,40 @@ def run_simulation(ticker="AAPL", data_file=None, short_window=50, long_window=2
     
     return output_file
 
+def _run_one(config):
+    """
+    Worker entry point: run one simulation from a config dictionary.
+    
+    Module-level so it can be pickled and sent to worker processes.
+    """
+    return run_simulation(**config)
+
+def run_simulations_batch(configs, max_workers=None):
+    """
+    Run several simulations in parallel worker processes.
+    
+    Args:
+        configs: List of dictionaries of run_simulation keyword arguments
+        max_workers: Number of worker processes (defaults to the CPU count;
+            1 runs the simulations sequentially)
+        
+    Returns:
+        List of report file paths, in the same order as configs
+    """
+    # Create the default data file once up front, not in every worker
+    if any(config.get('data_file') is None for config in configs):
+        default_file = ensure_sample_data()
+        configs = [dict(config, data_file=config.get('data_file') or default_file) for config in configs]
+    
+    if max_workers is None:
+        max_workers = min(len(configs), os.cpu_count() or 1)
+    
+    if max_workers <= 1:
+        return [_run_one(config) for config in configs]
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_run_one, configs))
+
 def main():
     """Main entry point for the simulation script."""
     parser = argparse.ArgumentParser(description='Run trading strategy simulation')
@@ -1,12 +1,215 @@
 """
 Moving Average Crossover trading strategy implementation.
 """
+import hashlib
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from utils.logger import get_logger
+from ._njit import njit
 
 logger = get_logger(__name__)
 
+@njit(cache=True)
+def _rolling_mean(a, w):
+    """
+    Trailing moving average with a running window sum.
+    
+    As with pandas rolling().mean(), a window containing a missing
+    (non-finite) value averages to NaN; missing values are kept out of the
+    running sum so later windows are unaffected.
+    
+    Args:
+        a: Contiguous float64 array of values
+        w: Number of periods in the window
+        
+    Returns:
+        Array of the same length, NaN until the window is full
+    """
+    n = a.shape[0]
+    out = np.empty(n)
+    s = 0.0
+    missing = 0
+    
+    # Add the newest value and drop the oldest at each step
+    for i in range(n):
+        value = a[i]
+        if np.isfinite(value):
+            s += value
+        else:
+            missing += 1
+        
+        if i >= w:
+            old = a[i - w]
+            if np.isfinite(old):
+                s -= old
+            else:
+                missing -= 1
+        
+        if i >= w - 1 and missing == 0:
+            out[i] = s / w
+        else:
+            out[i] = np.nan
+    return out
+
+def rolling_mean(values, window):
+    """
+    Compute a trailing moving average.
+    
+    Args:
+        values: 1-D array of values
+        window: Number of periods in the window
+        
+    Returns:
+        Array of the same length, NaN until the window is full
+    """
+    return _rolling_mean_kernel(np.ascontiguousarray(values, dtype=np.float64), window)
+
+@njit(cache=True)
+def _reduce_events(close, position, initial_capital):
+    """
+    Run the all-in / all-out cash and shares recurrence over crossover days only.
+    
+    Args:
+        close: Closing prices on the crossover days
+        position: Crossover signals on those days (1.0: buy, -1.0: sell)
+        initial_capital: Starting cash
+        
+    Returns:
+        Tuple of (cash, shares) arrays; element 0 is the state before the
+        first event and element k + 1 the state after event k
+    """
+    m = close.shape[0]
+    cash_at_event = np.empty(m + 1)
+    shares_at_event = np.empty(m + 1)
+    
+    cash = initial_capital
+    shares = 0.0
+    cash_at_event[0] = cash
+    shares_at_event[0] = shares
+    for k in range(m):
+        price = close[k]
+        if position[k] == 1.0:  # Buy with all available cash
+            shares_to_buy = cash // price
+            shares += shares_to_buy
+            cash -= shares_to_buy * price
+        else:  # Sell all shares
+            cash += shares * price
+            shares = 0.0
+        cash_at_event[k + 1] = cash
+        shares_at_event[k + 1] = shares
+    
+    return cash_at_event, shares_at_event
+
+# Prefer the ahead-of-time compiled kernels (see trading/_kernels_build.py)
+# over JIT compilation on first call
+try:
+    from . import trading_kernels as _aot_kernels
+except ImportError:
+    _aot_kernels = None
+
+_rolling_mean_kernel = _aot_kernels.rolling_mean if _aot_kernels else _rolling_mean
+_reduce_events_kernel = _aot_kernels.reduce_events if _aot_kernels else _reduce_events
+
+def _simulate(close, position, initial_capital):
+    """
+    Simulate the all-in / all-out strategy over every bar.
+    
+    Cash and shares only change on crossover days, so the compiled reducer
+    walks just those and the state is then held between them in bulk.
+    
+    Args:
+        close: Closing prices (contiguous float64)
+        position: Crossover signals (1.0: buy, -1.0: sell, otherwise hold)
+        initial_capital: Starting cash
+        
+    Returns:
+        Tuple of (holdings, cash, total) arrays
+    """
+    n = close.shape[0]
+    event_idx = np.flatnonzero((position == 1.0) | (position == -1.0))
+    cash_at_event, shares_at_event = _reduce_events_kernel(
+        close[event_idx], position[event_idx], initial_capital
+    )
+    
+    # Each state lasts from its event up to the next one
+    run_lengths = np.diff(event_idx, prepend=0, append=n)
+    cash_arr = np.repeat(cash_at_event, run_lengths)
+    holdings = np.repeat(shares_at_event, run_lengths) * close
+    
+    return holdings, cash_arr, holdings + cash_arr
+
+# Signals for recently seen (windows, close prices) combinations. Entries are
+# keyed on a digest of the prices, so they hold only the outputs and not a
+# copy of the input series.
+_SIGNAL_CACHE_SIZE = 32
+_signal_cache = OrderedDict()
+
+def _compute_signals(short_window, long_window, close):
+    """
+    Compute moving averages, signals and crossovers for a close price series.
+    
+    Cached so that parameter sweeps over the same data reuse earlier work.
+    The key combines the windows with the dtype, length and a 128-bit BLAKE2b
+    digest of the prices, hashed in place without copying them.
+    
+    Args:
+        short_window: Short moving average window
+        long_window: Long moving average window
+        close: Contiguous float64 array of close prices
+        
+    Returns:
+        Tuple of read-only (short MA, long MA, signal, position) arrays;
+        position is int8, the others float32
+    """
+    key = (
+        short_window, long_window, close.dtype.str, close.shape[0],
+        hashlib.blake2b(close, digest_size=16).digest(),
+    )
+    arrays = _signal_cache.get(key)
+    if arrays is not None:
+        _signal_cache.move_to_end(key)
+        return arrays
+    
+    arrays = _signal_arrays(short_window, long_window, close)
+    _signal_cache[key] = arrays
+    if len(_signal_cache) > _SIGNAL_CACHE_SIZE:
+        _signal_cache.popitem(last=False)
+    return arrays
+
+def _signal_arrays(short_window, long_window, close):
+    """
+    Compute the uncached signal arrays for _compute_signals.
+    
+    Args:
+        short_window: Short moving average window
+        long_window: Long moving average window
+        close: Contiguous float64 array of close prices
+        
+    Returns:
+        Tuple of read-only (short MA, long MA, signal, position) arrays
+    """
+    ma_short = rolling_mean(close, short_window)
+    ma_long = rolling_mean(close, long_window)
+    
+    # True while the short MA is above the long MA
+    above = ma_short > ma_long
+    signal = above.astype(np.float32)
+    
+    # Crossovers (1: buy, -1: sell, 0: hold) from adjacent states, as int8;
+    # the first row has no previous state and counts as hold
+    state = above.view(np.int8)
+    position = np.zeros(state.shape[0], dtype=np.int8)
+    position[1:] = state[1:] - state[:-1]
+    
+    # Crossovers are decided in float64 above; the averages are only kept for
+    # reports and charts, so they are stored as float32. Signal values are
+    # 0/1 and exact in float32.
+    arrays = (ma_short.astype(np.float32), ma_long.astype(np.float32), signal, position)
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
 class MovingAverageCrossoverStrategy:
     def __init__(self, short_window=50, long_window=200):
         """
@@ -29,34 +232,40 @@ class MovingAverageCrossoverStrategy:
         Returns:
             DataFrame with added signal columns
         """
-        # Make a copy to avoid modifying the original
-        signals = df.copy()
-        
         # Check if 'close' column exists
-        if 'close' not in signals.columns:
-            if 'price' in signals.columns:
-                signals['close'] = signals['price']
-            else:
-                logger.error("No 'close' or 'price' column found in data")
-                return signals
+        if 'close' in df.columns:
+            close = df['close']
+        elif 'price' in df.columns:
+            close = df['price']
+        else:
+            logger.error("No 'close' or 'price' column found in data")
+            return df.copy()
         
-        # Create short and long moving averages
-        signals[f'MA_{self.short_window}'] = signals['close'].rolling(window=self.short_window).mean()
-        signals[f'MA_{self.long_window}'] = signals['close'].rolling(window=self.long_window).mean()
-        
-        # Create signals (1: buy, -1: sell, 0: hold)
-        signals['signal'] = 0.0
-        
-        # Generate buy/sell signals
-        signals['signal'] = np.where(
-            signals[f'MA_{self.short_window}'] > signals[f'MA_{self.long_window}'], 1.0, 0.0
+        # Moving averages, signals and crossovers, memoized per price series
+        close_values = np.ascontiguousarray(close.to_numpy(dtype=np.float64))
+        ma_short, ma_long, signal, position = _compute_signals(
+            self.short_window, self.long_window, close_values
         )
         
-        # Generate trading orders: detect crossovers
-        signals['position'] = signals['signal'].diff()
+        # Build the new columns once and attach them without copying the input
+        new_columns = {}
+        if 'close' not in df.columns:
+            new_columns['close'] = close.to_numpy()
+        new_columns[f'MA_{self.short_window}'] = ma_short
+        new_columns[f'MA_{self.long_window}'] = ma_long
+        new_columns['signal'] = signal
+        new_columns['position'] = position
+        new_columns = pd.DataFrame(new_columns, index=df.index)
+        
+        # Recomputed columns replace any stale ones in the input
+        overlap = df.columns.intersection(new_columns.columns)
+        if len(overlap):
+            df = df.drop(columns=overlap)
+        signals = pd.concat([df, new_columns], axis=1, copy=False)
         
-        # Drop NaN values resulting from MA calculation
-        signals.dropna(inplace=True)
+        # Drop NaN values resulting from MA calculation; this also gives the
+        # caller its own copy rather than views of the input or the cache
+        signals = signals.dropna()
         
         return signals
     
@@ -69,60 +278,31 @@ class MovingAverageCrossoverStrategy:
             initial_capital: Starting capital for the simulation
             
         Returns:
-            DataFrame with portfolio performance metrics
+            DataFrame with close, position and portfolio performance columns
         """
         # Generate trading signals
         signals = self.generate_signals(df)
         
-        # Create a new DataFrame for portfolio metrics
-        portfolio = signals.copy()
-        
-        # Add holdings and cash columns
-        portfolio['holdings'] = 0.0
-        portfolio['cash'] = initial_capital
-        portfolio['total'] = initial_capital
-        portfolio['returns'] = 0.0
-        
-        # Iterate through each day
-        position = 0
-        for i in range(len(portfolio)):
-            # Update position based on signal
-            if portfolio['position'].iloc[i] == 1.0:  # Buy signal
-                # Calculate how many shares to buy with all available cash
-                price = portfolio['close'].iloc[i]
-                shares_to_buy = portfolio['cash'].iloc[i] // price
-                cost = shares_to_buy * price
-                
-                # Update holdings and cash
-                position += shares_to_buy
-                portfolio.loc[portfolio.index[i], 'holdings'] = position * price
-                portfolio.loc[portfolio.index[i], 'cash'] = portfolio['cash'].iloc[i] - cost
-                
-            elif portfolio['position'].iloc[i] == -1.0:  # Sell signal
-                # Sell all shares
-                price = portfolio['close'].iloc[i]
-                sale_proceeds = position * price
-                
-                # Update holdings and cash
-                position = 0
-                portfolio.loc[portfolio.index[i], 'holdings'] = 0
-                portfolio.loc[portfolio.index[i], 'cash'] = portfolio['cash'].iloc[i] + sale_proceeds
-            
-            else:  # Hold position
-                # Update holdings value
-                price = portfolio['close'].iloc[i]
-                portfolio.loc[portfolio.index[i], 'holdings'] = position * price
-                portfolio.loc[portfolio.index[i], 'cash'] = portfolio['cash'].iloc[i-1] if i > 0 else initial_capital
-            
-            # Calculate total value and returns
-            portfolio.loc[portfolio.index[i], 'total'] = portfolio['holdings'].iloc[i] + portfolio['cash'].iloc[i]
-            
-            if i > 0:
-                portfolio.loc[portfolio.index[i], 'returns'] = (
-                    portfolio['total'].iloc[i] / portfolio['total'].iloc[i-1] - 1
-                )
+        # The sequential cash/shares recurrence runs in a compiled reducer
+        close = np.ascontiguousarray(signals['close'].to_numpy(dtype=np.float64, copy=False))
+        position = np.ascontiguousarray(signals['position'].to_numpy(dtype=np.float64, copy=False))
+        n = close.shape[0]
+        
+        holdings, cash_arr, total = _simulate(close, position, float(initial_capital))
+        
+        returns = np.zeros(n)
+        returns[1:] = total[1:] / total[:-1] - 1
         
-        # Calculate cumulative returns
-        portfolio['cumulative_returns'] = (1 + portfolio['returns']).cumprod() - 1
+        # One DataFrame build; the moving average and signal columns are left
+        # out, callers that want them can use generate_signals directly
+        portfolio = pd.DataFrame({
+            'close': close,
+            'position': signals['position'].to_numpy(),
+            'holdings': holdings,
+            'cash': cash_arr,
+            'total': total,
+            'returns': returns,
+            'cumulative_returns': np.expm1(np.cumsum(np.log1p(returns))),  # Log space
+        }, index=signals.index)
         
         return portfolio
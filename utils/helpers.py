@@ -5,11 +5,18 @@ import os
 import json
 import csv
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Arrow's multithreaded CSV parser is used when pyarrow is installed
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
 def ensure_directory_exists(directory_path):
     """
     Create a directory if it doesn't exist.
@@ -17,22 +24,27 @@ def ensure_directory_exists(directory_path):
     Args:
         directory_path: Path to the directory
     """
-    if not os.path.exists(directory_path):
+    try:
         os.makedirs(directory_path)
         logger.info(f"Created directory: {directory_path}")
+    except FileExistsError:
+        pass
 
-def read_csv_to_dataframe(file_path):
+def read_csv_to_dataframe(file_path, usecols=None, dtype=None, parse_dates=None):
     """
     Read a CSV file into a pandas DataFrame.
     
     Args:
         file_path: Path to the CSV file
+        usecols: Columns to load (defaults to all)
+        dtype: Column dtypes, e.g. {'ticker': 'category'}
+        parse_dates: Columns to parse as datetimes while reading
         
     Returns:
         pandas.DataFrame containing the CSV data
     """
     try:
-        return pd.read_csv(file_path)
+        return pd.read_csv(file_path, engine=CSV_ENGINE, usecols=usecols, dtype=dtype, parse_dates=parse_dates)
     except Exception as e:
         logger.error(f"Error reading CSV file {file_path}: {e}")
         return pd.DataFrame()
@@ -61,6 +73,53 @@ def save_dataframe_to_csv(df, file_path):
         logger.error(f"Error saving DataFrame to {file_path}: {e}")
         return False
 
+def save_dataframe(df, file_path, format='auto'):
+    """
+    Save a pandas DataFrame as Parquet, Feather or CSV.
+    
+    Parquet (zstd) and Feather are columnar binary formats that write and
+    re-read much faster than CSV, so they suit intermediate results; CSV is
+    kept for user-facing files.
+    
+    Args:
+        df: pandas DataFrame to save
+        file_path: Path where to save the file
+        format: 'parquet', 'feather', 'csv', or 'auto' to choose from the
+            file extension (defaulting to CSV)
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if format == 'auto':
+        extension = os.path.splitext(file_path)[1].lower()
+        format = {'.parquet': 'parquet', '.feather': 'feather'}.get(extension, 'csv')
+    
+    if format == 'csv':
+        return save_dataframe_to_csv(df, file_path)
+    
+    try:
+        # Create directory if it doesn't exist
+        directory = os.path.dirname(file_path)
+        if directory:
+            ensure_directory_exists(directory)
+        
+        if format == 'parquet':
+            df.to_parquet(file_path, engine='pyarrow', compression='zstd')
+        elif format == 'feather':
+            # Feather only stores a default RangeIndex. A sliced RangeIndex
+            # carries no information, while other indexes become a column
+            if not df.index.equals(pd.RangeIndex(len(df))):
+                df = df.reset_index(drop=isinstance(df.index, pd.RangeIndex))
+            df.to_feather(file_path)
+        else:
+            raise ValueError(f"Unsupported format: {format}")
+        
+        logger.info(f"DataFrame saved to {file_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Error saving DataFrame to {file_path}: {e}")
+        return False
+
 def date_range(start_date, end_date):
     """
     Generate a range of dates between start and end dates.
@@ -69,13 +128,10 @@ def date_range(start_date, end_date):
         start_date: Starting date (datetime.date)
         end_date: Ending date (datetime.date)
         
-    Yields:
-        datetime.date objects in the range
+    Returns:
+        NumPy array of datetime.date objects in the range, inclusive
     """
-    current_date = start_date
-    while current_date <= end_date:
-        yield current_date
-        current_date += timedelta(days=1)
+    return pd.date_range(start_date, end_date, freq='D').date
 
 def format_s3_path(date_obj, base_path="trades"):
     """
@@ -90,6 +146,20 @@ def format_s3_path(date_obj, base_path="trades"):
     """
     return f"{date_obj.year}/{date_obj.month:02d}/{date_obj.day:02d}/{base_path}.csv"
 
+def format_s3_paths(dates, base_path="trades"):
+    """
+    Format S3 paths for many dates at once.
+    
+    Args:
+        dates: Sequence or array of dates
+        base_path: Base path prefix
+        
+    Returns:
+        NumPy array of S3 path strings, as format_s3_path would build them
+    """
+    pattern = f"%Y/%m/%d/{base_path.replace('%', '%%')}.csv"
+    return pd.DatetimeIndex(dates).strftime(pattern).to_numpy()
+
 def parse_date_string(date_str):
     """
     Parse a date string in YYYY-MM-DD format.
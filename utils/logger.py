@@ -1,56 +1,119 @@
 """
 Logging configuration.
 """
+import atexit
+import functools
 import logging
+import multiprocessing.util
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
 
+# Formatters are shared by every logger's handlers
+FILE_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+CONSOLE_FORMATTER = logging.Formatter('%(levelname)s - %(message)s')
+
+# File writes go through one queue per process, drained by a background
+# listener that owns the only RotatingFileHandler
+_log_queue = None
+_listener = None
+_queue_handlers = []
+
+def _start_listener():
+    """Create the log queue and start the file-writing listener thread."""
+    global _log_queue, _listener
+    
+    file_handler = RotatingFileHandler(
+        'logs/moneyy_ai.log', 
+        maxBytes=10*1024*1024,  # 10 MB
+        backupCount=5
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(FILE_FORMATTER)
+    
+    _log_queue = queue.Queue(-1)
+    _listener = QueueListener(_log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    
+    # Point existing handlers at the new queue (after a fork)
+    for handler in _queue_handlers:
+        handler.queue = _log_queue
+    
+    # Flush queued records on exit, for the main process and for
+    # multiprocessing workers, which skip atexit handlers
+    atexit.register(_stop_listener)
+    multiprocessing.util.Finalize(None, _stop_listener, exitpriority=10)
+
+def _stop_listener():
+    """Flush the log queue and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        listener, _listener = _listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+def _restart_listener_in_child():
+    """Give a forked child its own queue and listener; the thread isn't inherited."""
+    global _listener
+    if _listener is not None:
+        _listener = None
+        _start_listener()
+
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+def _configure(logger):
+    """
+    Attach the console handler and the queued file handler to a logger.
+    
+    Args:
+        logger: Logger to configure
+    """
+    if _listener is None:
+        _start_listener()
+    
+    logger.setLevel(logging.DEBUG)
+    
+    # Create console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(CONSOLE_FORMATTER)
+    
+    # Queue records for the file listener instead of writing them inline
+    queue_handler = QueueHandler(_log_queue)
+    queue_handler.setLevel(logging.DEBUG)
+    _queue_handlers.append(queue_handler)
+    
+    # Add handlers to logger
+    logger.addHandler(console_handler)
+    logger.addHandler(queue_handler)
+    
+    # The logger is fully handled here; skip the root logger's handlers
+    logger.propagate = False
+
+@functools.lru_cache(maxsize=None)
 def get_logger(name):
     """
     Create and return a logger with the given name.
     
+    Results are cached per name, so repeated calls skip the logging
+    module's lookup and handler checks.
+    
     Args:
         name: Logger name, usually __name__
         
     Returns:
         Logger instance configured with handlers
     """
-    # Create logger
     logger = logging.getLogger(name)
     
     # Only configure logger once
     if not logger.handlers:
-        logger.setLevel(logging.DEBUG)
-        
-        # Create formatters
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_formatter = logging.Formatter(
-            '%(levelname)s - %(message)s'
-        )
-        
-        # Create console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(console_formatter)
-        
-        # Create file handler
-        file_handler = RotatingFileHandler(
-            'logs/moneyy_ai.log', 
-            maxBytes=10*1024*1024,  # 10 MB
-            backupCount=5
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(file_formatter)
-        
-        # Add handlers to logger
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        _configure(logger)
         
     return logger
 